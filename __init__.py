@@ -25,6 +25,7 @@ Modules:
     reversed: provides Reversed class and SeqReversible ABC for reversing sequences' order.
     combinatorics: provides combinatoric sequences
         Product
+    mappedrecords: provides MappedRecords class, a sequence of fixed-width records in a memory-mapped file.
 """
 __author__ = "Simon Wyatt"
 __email__ = "simon.d.wyatt@gmail.com"
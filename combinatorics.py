@@ -30,19 +30,77 @@ Combinatoric sequences versus constructing a tuple from an `itertools` generator
 
 Classes:
     Product: Cartesian product of sequences.
-    Permutations
-    Combinations
-    CombinationsWithReplacement
-    Partitions
+    Permutations: Permutations of a sequence, in the order of `itertools.permutations`.
+    Combinations: Combinations of a sequence, in the order of `itertools.combinations`.
+    CombinationsWithReplacement: Combinations with replacement of a sequence, in the order of `itertools.combinations_with_replacement`.
+    Partitions: Partitions of a sequence into a given number of blocks.
 """
 
-import itertools, functools, operator, math
+import itertools, functools, operator, math, random, bisect
 from functools import reduce
 
-from reversed import Reversed, SeqReversible
-from seqslice import SeqSlice
+from reversed import Reversed, SeqReversible, _normalize_indices, _gather, _INT64_MAX, _CHUNK_SIZE
+from seqslice import SeqSlice, SeqSliceable, EmptySubsliceException
 
-class Product(SeqReversible):
+try: # NumPy is optional: batch operations use it when available, and fall back on pure Python otherwise.
+    import numpy
+except ImportError:
+    numpy = None
+
+def _searchable(seq):
+    """
+    Return whether `seq` searches itself (by `index` and `count`) in sublinear time, so needs no lookup table:
+    true for ranges, and for sequences whose `_seqtools_searchable` attribute is true (such as sorted `MappedRecords`).
+    """
+    return isinstance(seq, range) or getattr(seq, '_seqtools_searchable', False)
+
+_SKIP_LIMIT = 32 # Largest step size for which slices of some sequences step through items, rather than unranking each one.
+
+def _range_blocks(factors, lengths, first, last, pos=0):
+    """
+    Decompose a contiguous run of a Cartesian product into blocks that are themselves Cartesian products.
+    
+    Precondition : `factors` is a sequence of sequences with lengths `lengths`, and `first`, `last` are
+        multi-indices into `Product(*factors)` with `first[:pos] == last[:pos]` and `first <= last`.
+    Postcondition: Yields lists `[f[0], ..., f[n-1]]` of sequences, one per factor, such that chaining
+        `itertools.product(*f)` over the yielded lists produces, in order, the items of `Product(*factors)`
+        from the one at `first` to the one at `last` inclusive, restricted to positions `pos` onwards.
+        At most `2 * (len(factors) - pos) + 1` lists are yielded.
+    """
+    if pos == len(factors): # The run is the single item at `first == last`.
+        yield []
+        return
+    
+    factor = factors[pos]
+    if first[pos] == last[pos]: # Every item in the run has the same element at this position.
+        head = (factor[first[pos]],)
+        for block in _range_blocks(factors, lengths, first, last, pos + 1):
+            yield [head] + block
+        return
+    
+    # Otherwise the run splits into a ragged left part, a rectangular middle part, and a ragged right part.
+    # The left and right parts are absorbed into the middle whenever they happen to be full.
+    left_full  = all(i == 0     for i    in first[pos + 1:])
+    right_full = all(i == n - 1 for i, n in zip(last[pos + 1:], lengths[pos + 1:]))
+    lo = first[pos] if left_full  else first[pos] + 1
+    hi = last[pos] + 1 if right_full else last[pos]
+    
+    if not left_full: # From `first` to the end of its block at this position.
+        head = (factor[first[pos]],)
+        for block in _range_blocks(factors, lengths, first, [n - 1 for n in lengths], pos + 1):
+            yield [head] + block
+    if lo < hi: # Every item whose element at this position lies strictly between the ragged parts.
+        if isinstance(factor, (tuple, list, range)):
+            middle = factor[lo:hi]
+        else:
+            middle = SeqSlice(factor, slice(lo, hi))
+        yield [middle] + list(factors[pos + 1:])
+    if not right_full: # From the start of `last`'s block at this position to `last`.
+        head = (factor[last[pos]],)
+        for block in _range_blocks(factors, lengths, [0] * len(lengths), last, pos + 1):
+            yield [head] + block
+
+class Product(SeqReversible, SeqSliceable):
     """
     Precondition : `sequences` is a sequence of sequences.
     Postcondition: `Product(*sequences)` is the sequence consisting of the Cartesian product of the sequences from `sequences`,
@@ -52,6 +110,17 @@ class Product(SeqReversible):
     If `n` is a nonnegative integer, `Product(*sequences, repeat=n)` is the nth Cartesian power of `Product(*sequences)`.
     
     Standard warning about combinatoric sequences: Providing mutable inputs and then mutating them may result in undefined behavior.
+    In particular, the factors are frozen: their lengths are read once, at construction, and cached for use in all index
+    arithmetic, and the search methods cache a lookup table for each factor the first time they search it.
+    If a factor must change, call `refresh()` afterwards to resynchronize `self` with its factors.
+    For the same reason, slices of a Product are frozen `SeqSlice`s, which cache their bounds;
+    take them afresh after refreshing the product (or call their own `refresh()`).
+    
+    The search methods (`in`, `index`, `count`) look up each element of the searched item in a table mapping each element
+    of the corresponding factor to its first position and number of occurrences, so each lookup takes constant time
+    instead of scanning the factor. Factors with unhashable elements are searched directly instead, as are range factors
+    and other factors that search themselves in sublinear time (see `_searchable`), which are never enumerated.
+    Tables are built lazily, or all at once at construction if `Product(*sequences, prebuild_index=True)`.
     
     Examples:
         >>> list(Product((0,1), repeat=3))
@@ -72,26 +141,59 @@ class Product(SeqReversible):
     #                { s[i]        otherwise.
     # Representation invariant: None of the sequences t[1], ..., s[n] are strings.
     #   See the comment on the various search methods for further discussion of why this is important.
+    # Cached tables (valid under the frozen-factors contract, rebuilt by `refresh`):
+    #   _lengths[i] = len(t[i]),
+    #   _strides[i] = _lengths[i+1] * ... * _lengths[n], the weight of the i-th digit of a multi-index,
+    #   _len        = _lengths[1] * ... * _lengths[n],
+    #   _tables[i]  = None until built by `_table`; then a pair of dicts mapping each element of t[i] to its first position
+    #                 in t[i] and its number of occurrences in t[i], or False if t[i] is `_searchable` or has unhashable elements.
+    
+    __slots__ = ('_sequences', '_prebuild_index', '_tables', '_lengths', '_strides', '_len')
+    
+    _seqtools_frozen = True # Slices of a Product cache their bounds, as `self` caches its length; see `SeqSlice`.
     
     ################
     # Construction #
     ################
     
-    def __init__(self, *sequences, repeat=1):
+    def __init__(self, *sequences, repeat=1, prebuild_index=False):
         """
         Initialize a new Product instance.
         
         Any string elements of `sequences` are first converted to tuples.
         """
         self._sequences = tuple( (s if not isinstance(s, str) else tuple(s)) for s in sequences ) * repeat
+        self._prebuild_index = prebuild_index
+        self.refresh()
+    
+    def refresh(self):
+        """
+        Recompute the cached factor lengths, mixed-radix strides, and total length of `self`,
+        and discard the cached search tables of its factors.
+        
+        Only needed if a factor has changed since `self` was constructed; see the class docstring.
+        """
+        self._tables = [None] * len(self._sequences)
+        if self._prebuild_index:
+            for k in range(len(self._sequences)):
+                self._table(k)
+
+        self._lengths = tuple(len(s) for s in self._sequences)
+        strides = [1] * len(self._lengths)
+        for i in reversed(range(len(self._lengths) - 1)):
+            strides[i] = strides[i + 1] * self._lengths[i + 1]
+        self._strides = tuple(strides)
+        self._len = functools.reduce(operator.mul, self._lengths, 1)
+        # Correctness argument: The digit at position i of a multi-index counts blocks of items
+        # that agree in positions 0, ..., i, and each such block has as many items as the product
+        # of the factors after position i, which is the stride computed by the loop.
         
     def _seqtools_reversed(self):
         return self[::-1]
-        # Equivalently: The order on the product is reversed by distributing the reversal over the orders of the factors:
-        # return Product(*(Reversed(s) for s in self._sequences))
-        # But this potentially allocates len(self._sequences) `Reversed` instances, passing every subscript through as many
-        # index-reversal mappings, whereas the `self[::-1]` implementation just allocates one slice instance, and passes
-        # subscripts through just one (more complex) slice-index mapping.
+        # The order on the product is reversed by distributing the reversal over the orders of the factors,
+        # so `_simplify_slice` turns this into `Product(*(Reversed(s) for s in self._sequences))`.
+        # That passes every subscript through one index-reversal mapping per factor, but in exchange
+        # the reversed product keeps the C-level iteration and per-factor search of a product.
     
     def __repr__(self):
         return type(self).__name__ + "(" + ", ".join(repr(s) for s in self._sequences) + ")"
@@ -121,9 +223,9 @@ class Product(SeqReversible):
         >>> Product(range(1000000), repeat=10).len()
         1000000000000000000000000000000000000000000000000000000000000
         """
-        return functools.reduce(operator.mul, (len(s) for s in self._sequences), 1)
-        # Correctness argument: This is the well-known formula for the cardinality of the Cartesian product of finite sets.
-        # (Recall that the empty Cartesian product is {()}, the set whose sole element is the empty tuple.)
+        return self._len
+        # Correctness argument: `refresh` computes this by the well-known formula for the cardinality of the Cartesian
+        # product of finite sets. (Recall that the empty Cartesian product is {()}, the set whose sole element is the empty tuple.)
         
     
     def __len__(self):
@@ -139,15 +241,14 @@ class Product(SeqReversible):
         """
         # Correctness: By division into cases:
         if isinstance(index, slice):
+            simplified = self._simplify_slice(index)
+            if simplified is not None:
+                return simplified
             #return _ProductSlice(self, index) # See correctness argument in slice class
             return type(self).Slice(self, index)
-            # Future: Consider algebraic optimizations:
-            # detect when step size divides length of last factor and return product object over smaller factor
-            # if len(self._sequences[-1]) % index.step == 0: ...
-            # & similar cases.
         else:
             # Bounds check
-            L = self.len()
+            L = self._len
             if not (-L <= index < L):
                 raise IndexError("Product index out of range")
                 #if we didn't do this explicitly, the following would return `self[index % L]`
@@ -157,6 +258,96 @@ class Product(SeqReversible):
             # _multi_index is specified to return a tuple such that
             # the action specified by _elem_at returns the desired item.
     
+    def _simplify_slice(self, index):
+        """
+        Express a slice of `self` as a product of slices of its factors, if possible.
+        
+        Precondition : `index` is a slice object.
+        Postcondition: Returns a `Product` whose factors are the factors of `self`, or slices (`SeqSlice`, or `range`
+            for range factors) or reversals of them, and whose items are `self[index]`, if such a product exists;
+            otherwise returns None. Empty slices, and slices of the product of no factors, always return None.
+        
+        Examples:
+            >>> Product("ABCD", range(6))[6:18:2]
+            Product(<SeqSlice ('A', 'B', 'C', 'D')[1:3:]>, range(0, 6, 2))
+            
+            >>> Product("ABCD", range(6))[::-6]
+            Product(Reversed(('A', 'B', 'C', 'D')), range(5, -1, -6))
+            
+            >>> type(Product("ABCD", range(6))[2:9]).__qualname__ # Crosses a factor boundary without being aligned to it.
+            'Product.Slice'
+        """
+        if self._sequences == ():
+            return None
+        start, stop, step = index.indices(self._len)
+        if (step > 0 and start < stop) or (step < 0 and start > stop):
+            n = (abs(stop - start) - 1) // abs(step) + 1 # As in `SeqSlice.len`.
+        else:
+            return None
+        
+        # Work with the slice's items in ascending order within `self`, reversing at the end if necessary.
+        last = start + (n - 1) * step
+        lo, hi = (start, last) if step > 0 else (last, start)
+        S = abs(step) if n > 1 else 1 # A single item can be treated as a run with step size 1.
+        
+        # The slice is a product when its step size is `c * self._strides[pos]` for some factor `pos`
+        # such that `c` divides the length of that factor: Then every item has the same elements after `pos`,
+        # and its element at `pos` stays in one residue class modulo `c`. So the slice is a contiguous run
+        # through the product of the factors up to `pos`, with that factor replaced by every `c`th element.
+        for pos in reversed(range(len(self._sequences))):
+            stride = self._strides[pos]
+            if S % stride == 0 and self._lengths[pos] % (S // stride) == 0:
+                c = S // stride
+                break
+        else:
+            return None
+        
+        first_index, last_index = self._multi_index(lo), self._multi_index(hi)
+        r = first_index[pos] % c
+        # Multi-indices of the first and last items, and the factor lengths, in terms of the "virtual" factors
+        # up to `pos`, in which the factor at `pos` has been replaced by every `c`th element starting from `r`.
+        first_virtual = first_index[:pos] + (first_index[pos] // c,)
+        last_virtual  = last_index[:pos]  + (last_index[pos]  // c,)
+        lengths       = self._lengths[:pos] + (self._lengths[pos] // c,)
+        
+        # The run from `first_virtual` to `last_virtual` is rectangular only if, past the first position where they
+        # differ, `first_virtual` starts at the beginning and `last_virtual` ends at the end of each virtual factor.
+        split = next((k for k in range(pos + 1) if first_virtual[k] != last_virtual[k]), pos + 1)
+        if (any(i != 0     for i    in first_virtual[split + 1:])
+        or  any(i != L - 1 for i, L in zip(last_virtual[split + 1:], lengths[split + 1:]))):
+            return None
+        
+        # Assemble factors as (start, stop) ranges within the virtual factors, then map these to slices of the actual factors.
+        bounds = [(i, i + 1) for i in first_virtual[:split]]
+        if split <= pos:
+            bounds.append((first_virtual[split], last_virtual[split] + 1))
+            bounds += [(0, L) for L in lengths[split + 1:]]
+        factors = []
+        for k, (a, b) in enumerate(bounds):
+            if k == pos:
+                factors.append(self._factor_slice(k, slice(r + a * c, r + b * c, c)))
+            else:
+                factors.append(self._factor_slice(k, slice(a, b)))
+        factors += [self._factor_slice(k, slice(i, i + 1)) for k, i in enumerate(first_index[pos + 1:], pos + 1)]
+        
+        if step < 0:
+            factors = [Reversed(f) for f in factors]
+        return Product(*factors)
+    
+    def _factor_slice(self, k, s):
+        """
+        Return a lazy slice `s` of factor `k`: the factor itself if `s` spans all of it,
+        a range if the factor is a range, and a `SeqSlice` otherwise.
+        """
+        factor = self._sequences[k]
+        start, stop, step = s.indices(self._lengths[k])
+        if start == 0 and stop == self._lengths[k] and step == 1:
+            return factor
+        elif isinstance(factor, range):
+            return factor[s]
+        else:
+            return SeqSlice(factor, s)
+    
     def _multi_index(self, i):
         """
         Compute indices into each factor corresponding to index in product.
@@ -167,8 +358,8 @@ class Product(SeqReversible):
         `(s[0][i[0]], ..., s[n-1][i[n-1]]) = self[i % len(self)]`.
         """
         indices = ()
-        for s in reversed(self._sequences):
-            i, j = divmod(i, len(s))
+        for n in reversed(self._lengths):
+            i, j = divmod(i, n)
             indices = (j,) + indices
         return indices
         # Correctness argument:
@@ -186,7 +377,169 @@ class Product(SeqReversible):
         # Correctness argument: (s[indices[i]] for i, s in enumerate(self._sequences))
         # is equivalent to (self._sequences[i][indices[i]] for i in range(len(self._sequences))),
         # which is a generator expression for the sequence of values required by the postcondition.
+
+    #####################
+    # Batch item access #
+    #####################
+
+    def take(self, indices, index_matrix=False):
+        """
+        Return the items of `self` at each of the positions in `indices`, as a list of tuples.
+
+        Equivalent to `[self[i] for i in indices]`, but the whole batch of indices is bounds-checked and decoded
+        into multi-indices at once, and then elements are gathered from each factor in bulk.
+        Raises IndexError if any index is out of range.
+
+        If `index_matrix` is true, return the multi-indices instead of the items: row `k` holds the indices into
+        each factor of the item at `indices[k]`. This is a NumPy array of shape `(len(indices), number of factors)`
+        when NumPy is available and every index fits in an int64, and a list of tuples otherwise.
+
+        Examples:
+            >>> Product("AB", range(3)).take([0, 5, -1, 3])
+            [('A', 0), ('B', 2), ('B', 2), ('B', 0)]
+
+            >>> [tuple(map(int, row)) for row in Product("AB", range(3)).take([4, -6], index_matrix=True)]
+            [(1, 1), (0, 0)]
+        """
+        count, columns = self._decode_indices(indices)
+
+        if index_matrix:
+            if columns and numpy is not None and isinstance(columns[0], numpy.ndarray):
+                return numpy.stack(columns, axis=1)
+            elif columns:
+                return list(zip(*columns))
+            elif numpy is not None:
+                return numpy.empty((count, 0), dtype=numpy.int64)
+            else:
+                return [()] * count
+
+        if not columns: # Product of no factors: every in-bounds index gives the empty tuple.
+            return [()] * count
+        return list(zip(*(self._gather(s, column) for s, column in zip(self._sequences, columns))))
+        # Correctness argument: `columns[k][m]` is the index into factor `k` of the item at position `indices[m]`,
+        # by the specification of `_decode_indices`, so zipping the gathered columns assembles each item
+        # in the same way as `_elem_at`.
+
+    def _decode_indices(self, indices):
+        """
+        Bounds-check and decode a batch of indices into multi-indices, one factor at a time.
+
+        Precondition : `indices` is an iterable of integers (or a NumPy integer array).
+        Postcondition: Returns a pair `(count, columns)`, where `count` is the number of indices and `columns` is a list
+            with one entry per factor; `columns[k][m]` is the index into factor `k` of `self[indices[m]]`.
+            The columns are NumPy int64 arrays when NumPy is available and all indices fit in an int64,
+            and lists of Python integers otherwise.
+            Raises IndexError if any index is out of range.
+        """
+        lengths = self._lengths
+        positions = _normalize_indices(indices, self._len, "Product", vectorize=(numpy is not None))
+
+        if not isinstance(positions, list):
+            remainders = positions
+            columns = []
+            for n in reversed(lengths):
+                remainders, column = numpy.divmod(remainders, n)
+                columns.append(column)
+            columns.reverse()
+            return len(positions), columns
+
+        # Pure Python fallback: same mixed-radix arithmetic as `_multi_index`, but against precomputed factor lengths.
+        rows = []
+        for i in positions:
+            row = []
+            for n in reversed(lengths):
+                i, j = divmod(i, n)
+                row.append(j)
+            row.reverse()
+            rows.append(row)
+        columns = [[row[k] for row in rows] for k in range(len(lengths))]
+        return len(rows), columns
+
+    @staticmethod
+    def _gather(factor, column):
+        """
+        Get the elements of `factor` at each index in `column`, as a list;
+        through `factor.take` if it has one, e.g. for NumPy arrays and the sequences of this package.
+        """
+        return _gather(factor, column)
+    
+    ###################
+    # Random sampling #
+    ###################
     
+    def sample(self, k, replace=False, seed=None):
+        """
+        Return a list of `k` items of `self` chosen uniformly at random.
+        
+        Without replacement (the default), the items are taken from `k` distinct positions of `self`, in random order,
+        as for `random.sample`; raises ValueError if `k` exceeds the length of `self`. With `replace=True` each item is
+        chosen independently. `seed` is None, an integer seed, or a `random.Random` instance to draw from.
+        
+        Neither mode materializes `self` or depends on its length fitting in a machine integer.
+        
+        Examples:
+            >>> P = Product(range(10**6), repeat=10) # Longer than sys.maxsize
+            >>> len(P.sample(5)), len(set(P.sample(1000, seed=1)))
+            (5, 1000)
+            
+            >>> P.sample(3, seed=42) == P.sample(3, seed=42)
+            True
+        """
+        rng = self._random(seed)
+        if k < 0:
+            raise ValueError("Sample size must be nonnegative")
+        if replace:
+            return self._sample_with_replacement(k, rng)
+        
+        # Choose `k` distinct ranks by Robert Floyd's algorithm, which makes exactly `k` draws without rejection,
+        # and only stores the chosen ranks. Then shuffle them, since the algorithm doesn't choose them in random order.
+        L = self._len
+        if k > L:
+            raise ValueError("Sample larger than population")
+        chosen = set()
+        for j in range(L - k, L):
+            t = rng.randrange(j + 1)
+            chosen.add(t if t not in chosen else j)
+        ranks = list(chosen)
+        rng.shuffle(ranks)
+        return self.take(ranks)
+        # Correctness argument: By induction on `j`, after the iteration for `j` the set `chosen` is a uniformly random
+        # subset of `range(j + 1)` of size `j - (L - k) + 1`: either `t` is new, or it was already chosen,
+        # in which case `j` takes its place, and `j` cannot already have been chosen at the time.
+    
+    def random_iter(self, seed=None, batch=1024):
+        """
+        Return an infinite iterator over items of `self` chosen independently and uniformly at random.
+        
+        Items are drawn `batch` at a time, as by `self.sample(batch, replace=True)`.
+        `seed` is as for `sample`.
+        """
+        rng = self._random(seed)
+        return itertools.chain.from_iterable(self._sample_with_replacement(batch, rng) for _ in itertools.repeat(None))
+    
+    @staticmethod
+    def _random(seed):
+        """Return a `random.Random` instance determined by `seed`, as specified for `sample`."""
+        return seed if isinstance(seed, random.Random) else random.Random(seed)
+    
+    def _sample_with_replacement(self, k, rng):
+        """
+        Return a list of `k` items of `self` chosen independently and uniformly at random, drawing from `rng`.
+        """
+        if k > 0 and self._len == 0:
+            raise IndexError("Cannot choose from an empty sequence")
+        if not self._sequences:
+            return [()] * k
+        # A uniformly random item of a product is a tuple of independent, uniformly random elements of its factors,
+        # so draw a column of indices into each factor. This never touches indices into `self` itself,
+        # which may be too large for machine integers.
+        if numpy is not None:
+            generator = numpy.random.default_rng(rng.getrandbits(64))
+            columns = [generator.integers(0, n, size=k) for n in self._lengths]
+        else:
+            columns = [[rng.randrange(n) for _ in range(k)] for n in self._lengths]
+        return list(zip(*(self._gather(s, column) for s, column in zip(self._sequences, columns))))
+
     #############
     # Iteration #
     #############
@@ -198,6 +551,65 @@ class Product(SeqReversible):
     def __reversed__(self):
         return iter(self[::-1])
     
+    def iter_arrays(self, chunk_rows, start=None, stop=None, values=False):
+        """
+        Iterate over the items of `self[start:stop]` in blocks of `chunk_rows` rows at a time, as 2-D NumPy arrays.
+        
+        Each block has one row per item and one column per factor. By default the entries are the indices into each
+        factor (as in `take(..., index_matrix=True)`); with `values=True` they are the elements of the factors themselves,
+        which must then be numeric, with NumPy's usual type promotion across columns. Only the last block may be shorter.
+        Requires NumPy.
+        
+        The blocks are computed column by column with vectorized mixed-radix arithmetic, without forming any tuples,
+        so a whole sweep over `self` can be streamed through vectorized code in fixed memory.
+        
+        Examples:
+            >>> [block.tolist() for block in Product(range(2), (10, 20, 30)).iter_arrays(4, values=True)] # doctest: +SKIP
+            [[[0, 10], [0, 20], [0, 30], [1, 10]], [[1, 20], [1, 30]]]
+        """
+        start, stop, _ = slice(start, stop).indices(self._len)
+        return self._iter_arrays(start, 1, max(stop - start, 0), chunk_rows, values)
+    
+    def _iter_arrays(self, first, step, count, chunk_rows, values):
+        """
+        Generate the blocks specified by `iter_arrays` for the `count` items of `self` at indices `first + t*step`.
+        """
+        if numpy is None:
+            raise ImportError("{}.iter_arrays requires NumPy".format(type(self).__name__))
+        if chunk_rows < 1:
+            raise ValueError("chunk_rows must be positive")
+        
+        # Indices into `self` fit in int64 arithmetic unless `self` is very long;
+        # then fall back on NumPy's object arrays of Python integers, which are much slower but exact.
+        dtype = numpy.int64 if self._len <= _INT64_MAX else object
+        if values:
+            lookups = [self._value_lookup(s) for s in self._sequences]
+        
+        for offset in range(0, count, chunk_rows):
+            rows = min(chunk_rows, count - offset)
+            ranks = numpy.arange(rows, dtype=dtype) * step + (first + offset * step)
+            columns = [((ranks // stride) % n).astype(numpy.int64) for stride, n in zip(self._strides, self._lengths)]
+            # The digit at position `k` of the multi-index of a rank is the number of whole strides at `k`
+            # in the rank, modulo the length of factor `k`.
+            if values:
+                columns = [lookup(column) for lookup, column in zip(lookups, columns)]
+            if columns:
+                yield numpy.stack(columns, axis=1)
+            else:
+                yield numpy.empty((rows, 0), dtype=numpy.int64)
+    
+    @staticmethod
+    def _value_lookup(factor):
+        """
+        Return a function mapping an array of indices into `factor` to the array of elements at those indices.
+        """
+        if isinstance(factor, range): # Compute elements of ranges arithmetically rather than materializing them.
+            return lambda column: factor.start + column * factor.step
+        array = numpy.asarray(factor)
+        if array.dtype.kind not in 'biufc':
+            raise TypeError("iter_arrays(values=True) requires numeric factors, not {}".format(type(factor).__name__))
+        return array.__getitem__
+    
     ##########
     # Search #
     ##########
@@ -242,13 +654,11 @@ class Product(SeqReversible):
             raise TypeError("'in <{}>' requires tuple as left operand, not {}".format(type(self).__name__, type(item).__name__))
         if len(item) != len(self._sequences): # Explicit test guarantees expected result of `zip` below
             return False
-        return all(elem in factor for elem, factor in zip(item, self._sequences))
+        return all(self._find(k, elem) is not None for k, elem in enumerate(item))
         # Correctness argument: This is the definition of the Cartesian product.
         
-        # We could avoid the explicit length check by writing
-        #   sentinel = (x for x in ()) # Empty generator
-        #   return all(elem in factor for elem, factor in itertools.zip_longest(item, self._sequences, fillvalue=sentinel))
-        # but this is somewhat mysterious to read.
+        # We could avoid the explicit length check by zipping `item` with `self._sequences`
+        # using `itertools.zip_longest` and a sentinel fill value, but this is somewhat mysterious to read.
     
     def index(self, item): #, start = 0, stop = None): # Future: consider supporting start, stop parameters
         if self._sequences == (): # Special case
@@ -256,12 +666,16 @@ class Product(SeqReversible):
                 return 0
             #else:
             raise ValueError("Product.index(x): x = {} not in Product".format(item))
+        if not isinstance(item, tuple) or len(item) != len(self._sequences): # Else `zip` below would silently truncate.
+            raise ValueError("Product.index(x): x = {} not in Product".format(item))
         
         i = 0
-        for elem, factor in zip(item, self._sequences): # If self._sequences is empty this falls through immediately & returns zero
-                                                        # which is why we had to special-case that situation above.
-            i *= len(factor) # Future: overflow safety?
-            i += factor.index(elem) # Raises ValueError if `elem` not found in `factor`, therefore `item` not found in `self`.
+        for k, (elem, n) in enumerate(zip(item, self._lengths)): # If self._sequences is empty this falls through immediately
+                                                                 # & returns zero, which is why we had to special-case that situation above.
+            j = self._find(k, elem)
+            if j is None: # `elem` not found in factor `k`, therefore `item` not found in `self`.
+                raise ValueError("Product.index(x): x = {} not in Product".format(item))
+            i = i * n + j
         return i
     
     def count(self, item):
@@ -275,110 +689,712 @@ class Product(SeqReversible):
         # The number of ways that `item` can be formed as a tuple taking elements successively from `self._sequences`
         # is the product of the numbers of ways that each element of `item` occurs in its corresponding
         # factor of `self`.
-        sentinel = object()
-        elem_factor_pairs = zip(item, self._sequences)
         ways = 1
-        for elem, factor in elem_factor_pairs:            
-            ways *= factor.count(elem)
+        for k, elem in enumerate(item):
+            ways *= self._count(k, elem)
             if ways == 0:
                 return 0
         return ways
         # Equivalent to:
-        #   return functools.reduce(operator.mul, (factor.count(elem) for elem, factor in elem_factor_pairs), 1)
+        #   return functools.reduce(operator.mul, (self._count(k, elem) for k, elem in enumerate(item)), 1)
         # but this implementation short-circuits as soon as the element fails to be found in any factor.
-            
+    
+    # Per-factor search. Each of these consults the factor's lookup table when there is one,
+    # and otherwise falls back on the factor's own search methods.
+    
+    def _table(self, k):
+        """
+        Return the lookup table for factor `k`, building and caching it on first use.
+        
+        Postcondition: Returns a pair `(first, counts)` of dicts mapping each element of factor `k` to its first position
+            and its number of occurrences in factor `k`, or False if factor `k` is `_searchable` (so that it already
+            searches in sublinear time, and enumerating it would cost more than it saves) or has unhashable elements.
+        """
+        table = self._tables[k]
+        if table is None:
+            factor = self._sequences[k]
+            table = False
+            if not _searchable(factor):
+                first, counts = {}, {}
+                try:
+                    for j, x in enumerate(factor):
+                        if x in first:
+                            counts[x] += 1
+                        else:
+                            first[x] = j
+                            counts[x] = 1
+                except TypeError: # Unhashable element.
+                    pass
+                else:
+                    table = (first, counts)
+            self._tables[k] = table
+        return table
+        # Dict lookups match keys by identity or equality, like the `index` and `count` methods of built-in sequences,
+        # so the tables give the same answers as those methods for elements with consistent hashing and equality.
+    
+    def _find(self, k, elem):
+        """Return the first position of `elem` in factor `k`, or None if it does not occur there."""
+        table = self._table(k)
+        if table:
+            try:
+                return table[0].get(elem)
+            except TypeError: # Unhashable `elem` might still compare equal to some element, so search directly.
+                pass
+        try:
+            return self._sequences[k].index(elem)
+        except ValueError:
+            return None
+    
+    def _count(self, k, elem):
+        """Return the number of occurrences of `elem` in factor `k`."""
+        table = self._table(k)
+        if table:
+            try:
+                return table[1].get(elem, 0)
+            except TypeError:
+                pass
+        return self._sequences[k].count(elem)
+    
+    def _occurrences(self, k, elem):
+        """
+        Return the list of positions at which `elem` occurs in factor `k`, in increasing order.
+        """
+        first = self._find(k, elem)
+        if first is None:
+            return []
+        remaining = self._count(k, elem) - 1
+        positions = [first]
+        factor = self._sequences[k]
+        j = first + 1
+        while remaining > 0: # Scan onwards from the first occurrence only until every occurrence has been found.
+            x = factor[j]
+            if x is elem or x == elem:
+                positions.append(j)
+                remaining -= 1
+            j += 1
+        return positions
+    
+    # Sorted search. When every factor is sorted, and every factor but the last has no repeated elements,
+    # `self` is sorted in lexicographic order, so positions of arbitrary tuples (not necessarily items of `self`)
+    # can be found by binary search in each factor. (A repeated element in an earlier factor would interleave
+    # two blocks of items with the same prefix, so `self` would not be sorted.)
+    
+    def bisect_left(self, item):
+        """
+        Return the index at which `item` would be inserted into `self` to keep it sorted, before any equal items.
+        
+        Precondition: Every factor of `self` is sorted in ascending order, strictly so except perhaps for the last one,
+            and `item` is a tuple.
+        Postcondition: Every item of `self[:i]` is less than `item`, and every item of `self[i:]` is at least `item`,
+            where `i = self.bisect_left(item)`. Takes time proportional to the sum of the logarithms of the factor lengths.
+        
+        Examples:
+            >>> P = Product(range(0, 10, 2), "ACE")
+            >>> P.bisect_left((4, 'C')), P.bisect_left((5,)), P.bisect_left((4, 'D', 0))
+            (7, 9, 8)
+        """
+        return self._bisect(item, right=False)
+    
+    def bisect_right(self, item):
+        """
+        Return the index at which `item` would be inserted into `self` to keep it sorted, after any equal items.
+        
+        Precondition and postcondition as for `bisect_left`, mutatis mutandis.
+        """
+        return self._bisect(item, right=True)
+    
+    def range_query(self, lo, hi):
+        """
+        Return the slice of `self` consisting of the items `x` such that `lo <= x < hi`.
+        
+        Precondition as for `bisect_left`. The result is a lazy slice view, as from `self[a:b]`.
+        
+        Examples:
+            >>> list(Product(range(3), "AB").range_query((0, 'B'), (2,)))
+            [(0, 'B'), (1, 'A'), (1, 'B')]
+        """
+        return self[self.bisect_left(lo):self.bisect_left(hi)]
+    
+    def _bisect(self, item, right):
+        """Implement `bisect_left` (`right` false) or `bisect_right` (`right` true)."""
+        if not isinstance(item, tuple):
+            raise TypeError("{}.bisect requires tuple, not {}".format(type(self).__name__, type(item).__name__))
+        n = len(self._sequences)
+        # Whether items of `self` that agree with `item` in every factor sort before it (so should be counted)
+        # or after it. If `item` is longer than the items of `self`, these are proper prefixes of `item`, so lie before it;
+        # if shorter, `item` is a proper prefix of them, so they lie after it.
+        count_equal = len(item) > n or (right and len(item) == n)
+        rank = 0
+        for k in range(min(len(item), n)):
+            factor, elem = self._sequences[k], item[k]
+            lo = bisect.bisect_left(factor, elem)
+            hi = bisect.bisect_right(factor, elem, lo)
+            if lo == hi:
+                # `elem` doesn't occur in factor `k`, so the items with prefix `item[:k]` split at position `lo` there,
+                # regardless of the rest of `item`.
+                return rank + lo * self._strides[k]
+            rank += (hi - 1 if count_equal else lo) * self._strides[k]
+        return rank + 1 if count_equal else rank
+        # Correctness argument: By induction on `k`, `rank` is the index of the first item (or last, if `count_equal`)
+        # of `self` whose first `k` elements equal `item[:k]`, and the result counts the items of `self`
+        # less than (or at most) `item` among those before and within the block of such items.
+    
+    def _ranks(self, occurrences, descending=False):
+        """
+        Generate every index `i` such that `self[i]` is formed from the given positions in each factor,
+        in increasing (or decreasing) order.
+        
+        Precondition : `occurrences[k]` is an increasing list of positions in factor `k`, for each factor of `self`,
+            as from `_occurrences`.
+        """
+        if descending:
+            occurrences = [o[::-1] for o in occurrences]
+        for indices in itertools.product(*occurrences):
+            yield sum(i * stride for i, stride in zip(indices, self._strides))
+        # Correctness argument: `item` occurs at exactly those indices whose multi-indices select an occurrence
+        # of each element of `item` from the corresponding factor, which are the multi-indices generated here.
+        # Since the occurrence lists are sorted, `itertools.product` generates multi-indices in lexicographic order,
+        # which is the order of the corresponding indices.
+    
+    def _residue_counts(self, occurrences, modulus):
+        """
+        Tabulate the residues modulo `modulus` of the indices generated by `self._ranks(occurrences)`, factor by factor.
+        
+        Postcondition: Returns a list `counts` of `len(occurrences) + 1` dicts, where `counts[k]` maps each residue
+            to the number of ways of choosing a position from each of `occurrences[k:]` such that the sum of those
+            positions, weighted by the strides of their factors, has that residue.
+            Takes time proportional to the total length of the occurrence lists, plus the product of the numbers
+            of distinct residues (at most `modulus`) in each consecutive pair of tables.
+        """
+        counts = [{0: 1}]
+        for positions, stride in zip(reversed(occurrences), reversed(self._strides)):
+            factor = {}
+            for j in positions:
+                r = j * stride % modulus
+                factor[r] = factor.get(r, 0) + 1
+            combined = {}
+            for a, x in factor.items():
+                for b, y in counts[-1].items():
+                    r = (a + b) % modulus
+                    combined[r] = combined.get(r, 0) + x * y
+            counts.append(combined)
+        counts.reverse()
+        return counts
+    
+    def _count_ranks(self, occurrences, counts, modulus, residue, bound):
+        """
+        Return the number of indices generated by `self._ranks(occurrences)` that are at most `bound`
+        and congruent to `residue` modulo `modulus`.
+        
+        Precondition : `counts` is `self._residue_counts(occurrences, modulus)`.
+        """
+        if bound < 0:
+            return 0
+        if bound >= self._len:
+            return counts[0].get(residue % modulus, 0)
+        total, prefix = 0, 0
+        for k, (digit, positions, stride) in enumerate(zip(self._multi_index(bound), occurrences, self._strides)):
+            below = bisect.bisect_left(positions, digit)
+            for j in positions[:below]:
+                total += counts[k + 1].get((residue - prefix - j * stride) % modulus, 0)
+            if below == len(positions) or positions[below] != digit:
+                return total
+            prefix += digit * stride
+        return total + (1 if (prefix - residue) % modulus == 0 else 0)
+        # Correctness argument: An index is at most `bound` if and only if its multi-index is lexicographically
+        # at most that of `bound`: that is, either it is the multi-index of `bound`, or for some `k` it agrees with
+        # that of `bound` before `k` and has a smaller digit at `k`. For each `k`, the indices of the second kind
+        # with digit `j` at `k` are `prefix + j * stride` plus any of the sums tabulated by `counts[k + 1]`.
 
+    #############
+    # Filtering #
+    #############
+    
+    def where(self, i, predicate=None):
+        """
+        Return the product of the factors of `self`, with factor `i` restricted to its elements satisfying `predicate`.
+        
+        `self.where({i: predicate_i, j: predicate_j, ...})` filters several factors at once.
+        The result contains exactly the items `x` of `self` for which `predicate(x[i])` is true, in the same order,
+        and is itself a `Product`, with random access, length, search, slicing, and reversal.
+        Each predicate is called once per element of its factor, rather than once per item of `self`.
+        A range factor stays a range if the elements satisfying its predicate are still evenly spaced.
+        Raises TypeError if a predicate is not callable or is missing, and IndexError if a factor index is out of range.
+        
+        Examples:
+            >>> P = Product(range(4), "ABC").where(0, lambda x: x % 2 == 1)
+            >>> P
+            Product(range(1, 4, 2), ('A', 'B', 'C'))
+            >>> list(P[::-2])
+            [(3, 'C'), (3, 'A'), (1, 'B')]
+            
+            >>> list(Product(range(3), "AB", range(2)).where({0: bool, -1: bool}))
+            [(1, 'A', 1), (1, 'B', 1), (2, 'A', 1), (2, 'B', 1)]
+        """
+        return self._where(self._predicates(i, predicate))[0]
+    
+    def _predicates(self, i, predicate):
+        """
+        Validate the arguments of `where`, returning a dict mapping the nonnegative position of each factor to filter
+        to its predicate.
+        """
+        if predicate is None:
+            if not isinstance(i, dict):
+                raise TypeError("{}.where requires a predicate for factor {!r}, or a dict of predicates".format(type(self).__name__, i))
+            predicates = i
+        else:
+            predicates = {i: predicate}
+        positions = range(len(self._sequences))
+        normalized = {}
+        for k, predicate in predicates.items():
+            if not callable(predicate):
+                raise TypeError("{}.where: predicate for factor {!r} is not callable".format(type(self).__name__, k))
+            try:
+                normalized[positions[k]] = predicate # Normalize negative positions, and bounds-check.
+            except IndexError:
+                raise IndexError("{}.where: factor index out of range".format(type(self).__name__)) from None
+            except TypeError:
+                raise TypeError("{}.where: factor indices must be integers, not {}".format(type(self).__name__, type(k).__name__)) from None
+        return normalized
+    
+    def _where(self, predicates):
+        """
+        Return a pair `(product, kept)`, where `product` is `self` with each factor restricted to the elements satisfying
+        its predicate in `predicates` (as returned by `_predicates`), and `kept[k]` is the increasing sequence of positions
+        in factor `k` of `self` of the elements of factor `k` of `product`.
+        """
+        factors = list(self._sequences)
+        kept = [range(n) for n in self._lengths]
+        for k, predicate in predicates.items():
+            factor = factors[k]
+            kept[k] = [j for j, x in enumerate(factor) if predicate(x)]
+            if isinstance(factor, range) and self._evenly_spaced(kept[k]):
+                first, last = (kept[k][0], kept[k][-1]) if kept[k] else (0, -1)
+                step = kept[k][1] - first if len(kept[k]) > 1 else 1
+                factors[k] = factor[first:last + 1:step]
+            else:
+                factors[k] = tuple(factor[j] for j in kept[k])
+        return Product(*factors, prebuild_index=self._prebuild_index), kept
+        # Correctness argument: An item of a Cartesian product satisfies a predicate of its `i`th element if and only if
+        # that element satisfies the predicate, so restricting the `i`th factor to satisfying elements selects exactly
+        # the satisfying items. Keeping the positions in increasing order preserves the order of each factor,
+        # so the lexicographic order is preserved. The positions of a range factor are evenly spaced exactly
+        # when the elements at those positions are, and then a slice of the range selects those elements.
+    
+    @staticmethod
+    def _evenly_spaced(positions):
+        """Return whether consecutive elements of the list `positions` all differ by the same amount."""
+        return len({b - a for a, b in zip(positions, positions[1:])}) <= 1
+    
     class Slice(SeqSlice):
-        def __iter__(self):
-            ###############################
-            # Initialize generator state: #
-            ###############################
+        __slots__ = ()
         
-            start, stop, step = self._slice.start, self._slice.stop, self._slice.step
+        def __getitem__(self, index):
+            """
+            Return `self[index]`. Sub-slices are taken from the base product, so that they are simplified where possible.
+            """
+            if isinstance(index, slice):
+                try:
+                    subslice = self._compose_slice(index)
+                except EmptySubsliceException:
+                    return self._seq[0:0] # An empty slice of the same product.
+                return self._seq[subslice]
+            else:
+                return super().__getitem__(index)
         
-            # Initialize step: Normalize by rejecting zero and defaulting None -> 1
-            if step == 0:
-                raise ValueError("slice step cannot be zero")
-            if step is None:
-                step = 1
-
-            # Initialize start: Normalize by clipping to bounds, handling None
-            L = self._baselen() # Precompute base length for repeated reuse
-            if start is None:
-                start = 0 if step>0 else -1
+        def __iter__(self):
+            aligned = self._iter_aligned()
+            if aligned is not None:
+                return aligned
+            return self._iter_carry()
+        
+        def _iter_aligned(self):
+            """
+            Iterate over `self` in C-level blocks of `itertools.product`, if the step size allows it; else return None.
+            
+            This applies when the step size is, up to sign, the stride of some factor of the base product
+            (in particular for steps of 1 and -1, the stride of the last factor).
+            Every item in the slice then has the same elements in the factors after that one,
+            and the items' elements in the remaining factors run contiguously through the product of those factors,
+            so the slice splits into a few rectangular blocks, each iterated by `itertools.product`.
+            """
+            base = self._seq
+            if base._sequences == ():
+                return None # The general iterator handles this special case.
+            start, stop, step = self._bounds()
+            n = self.len()
+            if n == 0:
+                return iter(())
+            
+            # Find the innermost factor whose stride matches the step size.
+            for pos in reversed(range(len(base._strides))):
+                if base._strides[pos] == abs(step):
+                    break
             else:
-                if ((start >= L and step > 0)
-                or  (start < -L and step < 0)):
-                    # Started too late to capture any items.
-                    return
-                elif start >= L and step < 0:
-                    # Clip to back.
-                    start = L - 1
-                elif start < -L and step > 0:
-                    # Clip to front
-                    start = -L
+                return None
+            
+            # Multi-indices of the first and last items of the slice in ascending order within the base product.
+            last = start + (n - 1) * step
+            lo, hi = (start, last) if step > 0 else (last, start)
+            first_index, last_index = base._multi_index(lo), base._multi_index(hi)
+            # These agree after `pos`, since `lo` and `hi` are congruent modulo the stride there.
+            
+            factors = base._sequences[:pos + 1]
+            suffix = [(s[i],) for s, i in zip(base._sequences[pos + 1:], first_index[pos + 1:])]
+            blocks = _range_blocks(factors, base._lengths[:pos + 1], first_index[:pos + 1], last_index[:pos + 1])
+            if step < 0:
+                # The reversal of a product is the product of the reversed factors, so reverse the order of the blocks
+                # and the order of each factor within each block.
+                blocks = [[Reversed(f) for f in block] for block in reversed(list(blocks))]
+            return itertools.chain.from_iterable(itertools.product(*block, *suffix) for block in blocks)
         
+        def _iter_carry(self):
+            """Iterate over `self` for an arbitrary step size, propagating carries through a mutable multi-index."""
+            ###############################
+            # Initialize generator state: #
+            ###############################
+            
+            # Normalize start, stop, and step against the base length. Counting off exactly `self.len()` items
+            # then stops the generator, so there's no need to compare multi-indices against that of `stop`
+            # (which `_multi_index` would wrap around modulo the base length when `stop` lies past either end).
+            start, stop, step = self._bounds()
+            remaining = self.len()
+            if remaining == 0:
+                return
+            
             if self._seq._sequences == (): # Special case for product of empty sequence of sequences:
                                            # If we've gotten this far, capture the one item there and stop.
                 yield ()
                 return
-        
-            # Initialize stop: None is okay, handled explicitly by generator. Convert to multi-index.
-            if stop is not None:
-                stop = list(self._seq._multi_index(stop)) # We won't mutate `stop`, but it has to be comparable to the mutable `indices`.
+            
+            sequences, lengths = self._seq._sequences, self._seq._lengths
             
             ###################
             # Generate items. #
             ###################
-        
+            
             indices = list( self._seq._multi_index(start) )
             item = list(self._seq._elem_at(indices))
             yield tuple(item) #The first one.
-            while stop is None or (step > 0 and indices < stop) or (step < 0 and stop < indices): # If stop is None we'll explicitly break when done.
+            for _ in range(remaining - 1):
                 indices[-1] += step
-                pos = len(self._seq._sequences) - 1
+                pos = len(lengths) - 1
                 # Propagate carries back through multi-index, updating item as we go.
                 # We only update the entries of the item that need updating, instead of regenerating the entire item tuple when any part of the index changes,
                 # which is our principal efficiency gain over iteration by direct access to a range of individual elements.
-                while pos > 0 and not (0 <= indices[pos] < len(self._seq._sequences[pos])):
-                    q, indices[pos] = divmod(indices[pos], len(self._seq._sequences[pos]))
+                while pos > 0 and not (0 <= indices[pos] < lengths[pos]):
+                    q, indices[pos] = divmod(indices[pos], lengths[pos])
                     indices[pos - 1] += q
-                    item[pos] = self._seq._sequences[pos][indices[pos]]
+                    item[pos] = sequences[pos][indices[pos]]
                     pos -= 1
-                if pos == 0 and not (0 <= indices[pos] < len(self._seq._sequences[pos])): #Ran off end of product.
-                    break # Here's the explicit break for if stop was None.
-                # else
-                item[pos] = self._seq._sequences[pos][indices[pos]] # One more time for last carry.
+                item[pos] = sequences[pos][indices[pos]] # One more time for last carry.
                 yield tuple(item)
-        
+            
             # Correctness argument:
             # PENDING. Most complex and most important method for products, will have most complex & important proof.
+        
+        def where(self, i, predicate=None):
+            """
+            Return the items `x` of `self` for which `predicate(x[i])` is true, in the same order, as for `Product.where`.
+            
+            The result is a slice of `self._seq.where(i, predicate)`, so it has the same random access as `self`.
+            Only slices with a step of 1 or -1 can be filtered, since the satisfying items of other slices are not
+            evenly spaced in the filtered product: Raises ValueError for other steps.
+            """
+            base = self._seq
+            predicates = base._predicates(i, predicate)
+            start, _, step = self._bounds()
+            if abs(step) != 1:
+                raise ValueError("{}.where requires a slice with step 1 or -1, not {}".format(type(self).__name__, step))
+            filtered, kept = base._where(predicates)
+            n = self.len()
+            if n == 0:
+                return filtered[0:0]
+            first, last = sorted((start, start + (n - 1) * step))
+            counts = base._residue_counts(kept, 1)
+            lo = base._count_ranks(kept, counts, 1, 0, first - 1)
+            hi = base._count_ranks(kept, counts, 1, 0, last)
+            return filtered[lo:hi] if step > 0 else filtered[lo:hi][::-1]
+            # Correctness argument: The items of `filtered` are the items of `base` whose multi-indices are drawn from
+            # `kept`, in the same order, so those lying in `self` are the items of `filtered` whose indices in `base`
+            # lie between `first` and `last`, and these form the block of `filtered` after the `lo` items
+            # whose indices in `base` are before `first`, up to the `hi` whose indices are at most `last`.
+        
+        def iter_arrays(self, chunk_rows, start=None, stop=None, values=False):
+            """
+            Iterate over the items of `self[start:stop]` in blocks of 2-D NumPy arrays, as for `Product.iter_arrays`.
+            """
+            first, _, step = self._bounds()
+            start, stop, _ = slice(start, stop).indices(self.len())
+            return self._seq._iter_arrays(first + start * step, step, max(stop - start, 0), chunk_rows, values)
+        
+        ##########
+        # Search #
+        ##########
+        
+        # Rather than traversing the slice, these methods find the positions at which each element of an item occurs
+        # in the corresponding factor of the base product, and then count the indices of the base product formed from
+        # those positions that lie in the slice: those in the range of indices spanned by the slice, and congruent to
+        # its start modulo its step. They choose the cheapest of three ways to do so:
+        #   1. Generate each such index of the base product and test it, as `_positions` does. This takes time
+        #      proportional to the product of the numbers of occurrences of the elements, so suits items occurring
+        #      in few places.
+        #   2. Count the indices of each residue modulo the step size arithmetically, by `Product._count_ranks`.
+        #      This takes time proportional to the total number of occurrences of the elements, plus at most
+        #      the square of the step size per factor, however many places the item occurs in.
+        #   3. Compare each item of the slice, when the slice (or the range being searched) is shorter still.
+        # `index` finds the first occurrence with methods 2 and 3 by counting occurrences in successively wider windows.
+        
+        def _occurrences(self, item):
+            """
+            Return the list of increasing lists of positions of each element of `item` in the corresponding factor
+            of the base product, or None if `item` is not a tuple of the same length as the items of the base product.
+            """
+            base = self._seq
+            if not isinstance(item, tuple) or len(item) != len(base._sequences):
+                return None
+            return [base._occurrences(k, elem) for k, elem in enumerate(item)]
+        
+        def _method(self, occurrences, lo, hi):
+            """
+            Return 1, 2, or 3, according to which of the methods described above is cheapest for searching
+            `self[lo:hi]` for the item whose elements occur at the given positions.
+            """
+            modulus = abs(self._bounds()[2])
+            lengths = [len(positions) for positions in occurrences]
+            ranks = reduce(operator.mul, lengths, 1)
+            residues, suffix = 0, 1
+            for n in reversed(lengths):
+                residues += n + min(n, modulus) * min(suffix, modulus)
+                suffix *= n
+            return min((ranks, 1), (residues, 2), (hi - lo, 3))[1]
+        
+        def _positions(self, occurrences):
+            """
+            Generate every index `i` such that `self[i]` is the item whose elements occur at the given positions,
+            in increasing order.
+            """
+            start, stop, step = self._bounds()
+            L = self.len()
+            for rank in self._seq._ranks(occurrences, descending = step < 0):
+                i, offset = divmod(rank - start, step)
+                if offset == 0 and 0 <= i < L:
+                    yield i
+            # Correctness argument: `self[i]` is `self._seq[start + i*step]` for `0 <= i < L`,
+            # so an occurrence of `item` at `rank` in the base product lies in `self` if and only if
+            # `rank - start` is a multiple of `step` by a factor in that range.
+            # Ranks are generated in ascending order for positive steps and descending order for negative steps,
+            # so the indices `i` are generated in increasing order either way.
+        
+        def _count(self, item, occurrences, lo, hi, counts=None):
+            """
+            Return the number of indices `i` with `lo <= i < hi` such that `self[i] == item`,
+            where `occurrences` is `self._occurrences(item)`.
+            
+            Precondition: `0 <= lo` and `hi <= self.len()`. If given, `counts` is
+                `self._seq._residue_counts(occurrences, abs(step))` for the step size of `self`, which is otherwise
+                computed afresh if needed, so callers counting repeatedly should compute it once and pass it in.
+            """
+            if lo >= hi:
+                return 0
+            method = self._method(occurrences, lo, hi)
+            if method == 1:
+                return sum(1 for i in self._positions(occurrences) if lo <= i < hi)
+            elif method == 3:
+                return sum(1 for x in self[lo:hi] if x == item)
+            start, _, step = self._bounds()
+            first, last = start + lo * step, start + (hi - 1) * step
+            if step < 0:
+                first, last = last, first
+            modulus = abs(step)
+            if counts is None:
+                counts = self._seq._residue_counts(occurrences, modulus)
+            return (self._seq._count_ranks(occurrences, counts, modulus, start, last)
+                  - self._seq._count_ranks(occurrences, counts, modulus, start, first - 1))
+            # Correctness argument: The indices of the base product lying in `self[lo:hi]` are those from `first`
+            # to `last` inclusive that are congruent to `start` modulo the step size.
+        
+        def __contains__(self, item):
+            """Return `item in self`. Raises TypeError if `item` is not a tuple, as for `Product`."""
+            if not isinstance(item, tuple):
+                raise TypeError("'in <{}>' requires tuple as left operand, not {}".format(type(self).__name__, type(item).__name__))
+            occurrences = self._occurrences(item)
+            return occurrences is not None and self._count(item, occurrences, 0, self.len()) > 0
+        
+        def index(self, item, start=0, stop=None):
+            """
+            Return the least index `i` with `start <= i < stop` such that `self[i] == item`.
+            Raise ValueError if no such index exists.
+            """
+            start, stop, _ = slice(start, stop).indices(self.len()) # Interpret `start` and `stop` as for list.index.
+            occurrences = self._occurrences(item)
+            if occurrences is not None and start < stop:
+                method = self._method(occurrences, start, stop)
+                if method == 1:
+                    for i in self._positions(occurrences):
+                        if i >= stop:
+                            break
+                        if i >= start:
+                            return i
+                else:
+                    # Count occurrences in windows of doubling width from `start` until one contains `item`,
+                    # then bisect that window. Each count uses whichever method is cheapest for its window,
+                    # sharing one table of residue counts for method 2. Only the cost of scanning shrinks with the window,
+                    # so a window uses method 2 only if the whole range does, and only then is the table needed.
+                    counts = self._seq._residue_counts(occurrences, abs(self._bounds()[2])) if method == 2 else None
+                    lo, width = start, 1
+                    while lo < stop:
+                        hi = min(lo + width, stop)
+                        if self._count(item, occurrences, lo, hi, counts) > 0:
+                            while hi - lo > 1:
+                                mid = (lo + hi) // 2
+                                if self._count(item, occurrences, lo, mid, counts) > 0:
+                                    hi = mid
+                                else:
+                                    lo = mid
+                            return lo
+                        lo, width = hi, 2 * width
+            raise ValueError("{}.index(x): x not in slice".format(type(self).__name__))
+            # Correctness argument: Each window starts where the last ended, and the bisection maintains that
+            # `item` occurs in `self[lo:hi]` but not in `self[start:lo]`, until `lo` is the only index left.
+        
+        def count(self, item):
+            """Count the number of occurrences of `item` in `self`."""
+            occurrences = self._occurrences(item)
+            if occurrences is None:
+                return 0
+            return self._count(item, occurrences, 0, self.len())
+
+class _FenwickTree:
+    """
+    Fenwick (binary indexed) tree recording which of the positions 0, ..., n-1 are free and which are taken.
+    
+    Postcondition: `rank(p)` returns the number of free positions before `p`, `select(k)` returns the `k`th free position
+        (counting from 0), and `take(p)` marks the free position `p` as taken, each in O(log n) time.
+    
+    Only the counts of taken positions are stored, in a dict, so construction takes constant time,
+    and a tree in which `r` positions have been taken holds at most `r * log n` counts.
+    """
+    
+    # Abstraction function: position p is taken iff it was passed to `take`.
+    # Representation invariant: `_taken.get(i, 0)` is the number of taken positions among p = i - (i & -i), ..., i - 1,
+    #   for 1 <= i <= n; that is, node i of a Fenwick tree over 1-based positions p + 1.
+    
+    __slots__ = ('_n', '_taken')
+    
+    def __init__(self, n):
+        self._n = n
+        self._taken = {}
+    
+    def take(self, p):
+        """Mark the free position `p` as taken."""
+        taken, i = self._taken, p + 1
+        while i <= self._n:
+            taken[i] = taken.get(i, 0) + 1
+            i += i & -i
+    
+    def rank(self, p):
+        """Return the number of free positions before `p`."""
+        taken, i, before = self._taken, p, 0
+        while i > 0:
+            before += taken.get(i, 0)
+            i -= i & -i
+        return p - before
+    
+    def select(self, k):
+        """
+        Return the `k`th free position.
+        
+        Precondition: `0 <= k < n - (number of taken positions)`.
+        """
+        taken, pos = self._taken, 0
+        step = 1 << self._n.bit_length()
+        while step:
+            node = pos + step
+            if node <= self._n:
+                free = step - taken.get(node, 0)
+                if free <= k:
+                    pos = node
+                    k -= free
+            step >>= 1
+        return pos
+        # Correctness argument: Binary lifting. Each step keeps `pos` a multiple of twice the current `step`,
+        # so node `pos + step` covers exactly the `step` positions pos, ..., pos + step - 1, of which `free` are free.
+        # The loop thus finds the greatest `pos` with fewer than (the original) `k + 1` free positions before it,
+        # which is the `k`th free position.
 
-class Permutations(SeqReversible):
+class _Combinatoric(SeqReversible, SeqSliceable):
+    """
+    Base class for the combinatoric sequences of arrangements of the elements of one input sequence `seq`,
+    taken `r` at a time.
+    
+    Subclasses define `_length`, computing the length of `self` from `self._n = len(seq)` and `self._r`,
+    and `_item`, computing the item at a given nonnegative index, and a `Slice` subclass of `SeqSlice`.
+    
+    Standard warning about combinatoric sequences: Providing mutable inputs and then mutating them may result in undefined behavior.
+    As with `Product`, `seq` is frozen: its length is read once, at construction, and the search methods cache a table
+    of the positions of each of its elements the first time they search it (unless it is `_searchable`). If `seq` must change, call `refresh()` afterwards.
+    For the same reason, slices are frozen `SeqSlice`s, which cache their bounds.
+    """
+    
+    # Abstraction function: s = { tuple(_seq) if `seq` was a string,
+    #                           { _seq        otherwise.
+    #   As with `Product`, the search methods depend on a string input being represented by its conversion to a tuple.
+    # Cached values (valid under the frozen-input contract, recomputed by `refresh`):
+    #   _n = len(s), _len = self._length(),
+    #   _positions = None until built by `_table`; then a dict mapping each element of s to the increasing list of its
+    #                positions in s, or False if s has unhashable elements. Never built if s is `_searchable`.
+    
+    __slots__ = ('_seq', '_r', '_n', '_len', '_positions')
+    
+    _seqtools_frozen = True # Slices cache their bounds, as `self` caches its length; see `SeqSlice`.
+    
     ################
     # Construction #
     ################
     
-    def __iter__(self, seq, r = None):
-        self._seq = seq
-        if r is None:
-            self._r = len(seq)
-        else:
-            self._r = r
+    def __init__(self, seq, r):
+        """
+        Initialize a new instance.
+        
+        A string `seq` is first converted to a tuple. Raises ValueError if `r` is negative.
+        """
+        self._seq = tuple(seq) if isinstance(seq, str) else seq
+        if r < 0:
+            raise ValueError("r must be non-negative")
+        self._r = r
+        self.refresh()
+    
+    def refresh(self):
+        """
+        Recompute the cached length of `self`, and discard the cached search table of its input.
+        
+        Only needed if the input has changed since `self` was constructed; see the class docstring.
+        """
+        self._n = len(self._seq)
+        self._len = self._length()
+        self._positions = None
     
     def _seqtools_reversed(self):
-        raise NotImplementedError
+        return self[::-1]
     
     def __repr__(self):
-        return "{}({}, {})".format(type(self).__name__, self._seq, self._r)
+        return "{}({!r}, {!r})".format(type(self).__name__, self._seq, self._r)
+    
+    def __eq__(self, other):
+        if type(other) is type(self):
+            return (self._seq, self._r) == (other._seq, other._r)
+        else:
+            return NotImplemented
     
     ##########
     # Length #
     ##########
     
     def len(self):
-        n = len(self._seq)
-        return math.factorial(n) // math.factorial(n - self._r)
+        """Compute length, avoiding CPython's implementation constraint that the return value of `__len__` may not exceed `sys.maxsize`."""
+        return self._len
+    
     def __len__(self):
         return self.len()
     
@@ -387,188 +1403,1035 @@ class Permutations(SeqReversible):
     ###############
     
     def __getitem__(self, index):
-        raise NotImplementedError
+        """
+        Return `self[index]`.
+        """
+        if isinstance(index, slice):
+            return type(self).Slice(self, index)
+        L = self._len
+        if not (-L <= index < L):
+            raise IndexError("{} index out of range".format(type(self).__name__))
+        return self._item(index + L if index < 0 else index)
     
     #############
     # Iteration #
     #############
     
-    def __iter__(self):
-        return itertools.permutations(self._seq, self._r)
     def __reversed__(self):
-        raise NotImplementedError
+        return iter(self._seqtools_reversed())
     
     ##########
     # Search #
     ##########
     
-    def __contains__(self, item):
-        raise NotImplementedError
+    def _table(self):
+        """
+        Return the lookup table for the input, building and caching it on first use.
+        
+        Postcondition: Returns a dict mapping each element of the input to the increasing list of its positions,
+            or False if the input has unhashable elements.
+        """
+        if self._positions is None:
+            table = {}
+            try:
+                for p, x in enumerate(self._seq):
+                    table.setdefault(x, []).append(p)
+            except TypeError: # Unhashable element.
+                table = False
+            self._positions = table
+        return self._positions
+    
+    def _occurrences(self, elem):
+        """Return the increasing list of positions at which `elem` occurs in the input."""
+        if _searchable(self._seq): # Find the first occurrence and the number of occurrences without a table.
+            try:
+                first = self._seq.index(elem)
+            except ValueError:
+                return []
+            remaining, positions = self._seq.count(elem), []
+            for p in range(first, self._n):
+                if remaining == 0:
+                    break
+                x = self._seq[p]
+                if x is elem or x == elem:
+                    positions.append(p)
+                    remaining -= 1
+            return positions
+        table = self._table()
+        if table is not False:
+            try:
+                return table.get(elem, [])
+            except TypeError: # Unhashable `elem` might still compare equal to some element, so search directly.
+                pass
+        return [p for p, x in enumerate(self._seq) if x is elem or x == elem]
+
+class _IncrementalSlice(SeqSlice):
+    """
+    Slice of a `_Combinatoric` sequence, iterated by stepping from each item to the next instead of unranking every item.
+    
+    The base sequence provides the state of the item at a nonnegative index as a mutable object (`_state`),
+    the item with a given state (`_value`), and in-place successor and predecessor operations (`_advance`, `_retreat`).
+    Iteration unranks only the first item of the slice, then applies the successor (for positive steps) or predecessor
+    (for negative steps) `|step|` times per item, or unranks each item afresh if `|step|` exceeds `_SKIP_LIMIT`.
+    
+    A base sequence may also provide `_run_blocks`, generating iterators that, chained together, produce its items
+    from the one with a given state onwards, typically as C-level `itertools` iterators. Slices with small steps
+    are then iterated by skipping through those instead, provided that they have at least as many items as the input
+    of the base sequence has elements, which pays for setting up the iterators. For negative steps, forward runs
+    over chunks of the slice are reversed in turn, as `Reversed` does with native sequences.
+    """
     
-    def index(self, item): #, start, stop):
-        raise NotImplementedError
+    __slots__ = ()
     
-    def count(self, item):
-        raise NotImplementedError
+    def __iter__(self):
+        base = self._seq
+        start, _, step = self._bounds()
+        n = self.len()
+        if n == 0:
+            return iter(())
+        if getattr(base, '_run_blocks', None) is not None and abs(step) <= _SKIP_LIMIT and n >= base._n:
+            if step > 0:
+                return self._run(start, step, n)
+            return self._iter_reversed_runs(start, step, n)
+        return self._iter_steps(start, step, n)
+    
+    def _run(self, start, step, n):
+        """Return an iterator over the `n` items of the base sequence at indices `start + t*step`, for positive `step`."""
+        base = self._seq
+        run = itertools.chain.from_iterable(base._run_blocks(base._state(start)))
+        return itertools.islice(run, 0, step * (n - 1) + 1, step)
+    
+    def _iter_reversed_runs(self, start, step, n):
+        """Generate the `n` items of the base sequence at indices `start + t*step`, for negative `step`."""
+        chunk = max(_CHUNK_SIZE, self._seq._n) # Each chunk pays for setting up its run, as in `__iter__`.
+        for t in range(0, n, chunk):
+            m = min(chunk, n - t)
+            yield from reversed(list(self._run(start + (t + m - 1) * step, -step, m)))
+    
+    def _iter_steps(self, start, step, n):
+        """Generate the `n` items of the base sequence at indices `start + t*step`, stepping from each to the next."""
+        base = self._seq
+        state = base._state(start)
+        yield base._value(state)
+        move = base._advance if step > 0 else base._retreat
+        i = start
+        for _ in range(n - 1):
+            i += step
+            if abs(step) > _SKIP_LIMIT:
+                state = base._state(i)
+            else:
+                for _ in range(abs(step)):
+                    move(state)
+            yield base._value(state)
+
+class Permutations(_Combinatoric):
+    """
+    Precondition : `seq` is a sequence, and `r` is None or a nonnegative integer.
+    Postcondition: `Permutations(seq, r)` is the sequence of the `r`-length permutations of the elements of `seq`,
+    in the order produced by `itertools.permutations(seq, r)`: the permutations of the positions of `seq`, in lexicographic
+    order. Elements are treated as unique based on their positions, not their values, so if `seq` has repeated elements,
+    so does `self`. `r` defaults to `len(seq)`, giving full-length permutations, and if `r > len(seq)`, `self` is empty.
+    A string `seq` is treated as a sequence of individual characters.
     
-    class Slice(SeqSlice):
-        pass
+    Standard warning about combinatoric sequences: Providing mutable inputs and then mutating them may result in undefined behavior.
+    In particular, `seq` is frozen; see `_Combinatoric`.
+    
+    Items are computed directly from their indices by unranking in the factorial number system, and `index` ranks,
+    each taking O(r log n) time for `n = len(seq)`, so `self` can be entered at any point without iterating up to it.
+    
+    Examples:
+        >>> P = Permutations('ABCD', 2)
+        >>> len(P), P[0], P[5], P[-1]
+        (12, ('A', 'B'), ('B', 'D'), ('D', 'C'))
+        
+        >>> list(P) == list(itertools.permutations('ABCD', 2))
+        True
+        
+        >>> P.index(('C', 'A')), ('C', 'C') in P
+        (6, False)
+        
+        >>> P = Permutations(range(30))
+        >>> P[10**30]
+        (0, 4, 9, 25, 18, 15, 17, 22, 7, 12, 6, 11, 8, 24, 29, 19, 26, 28, 1, 3, 5, 27, 13, 14, 23, 10, 20, 21, 2, 16)
         
-class Combinations(SeqReversible):
+        >>> P.index(P[10**30]) == 10**30
+        True
+    """
+    
+    # Abstraction function: the pair (s, r) represents the sequence of r-permutations of s (see `_Combinatoric`).
+    #   The item at index i is (s[p[0]], ..., s[p[r-1]]), where p is the i-th r-permutation of range(n), n = len(s),
+    #   in lexicographic order.
+    #
+    # Ranking: writing i = d[0] * w[0] + ... + d[r-1] * w[r-1] in the mixed radix with weights
+    #   w[k] = (n-k-1)! / (n-r)!, the number of r-permutations sharing a given prefix of length k+1,
+    #   the digit d[k] ranges over 0, ..., n-k-1, and p[k] is the d[k]-th (counting from 0) position not among
+    #   p[0], ..., p[k-1]. (This is the Lehmer code of p, truncated to its first r digits.)
+    
+    __slots__ = ()
+    
     ################
     # Construction #
     ################
     
-    def __iter__(self, seq, r):
-        raise NotImplementedError
+    def __init__(self, seq, r=None):
+        """
+        Initialize a new Permutations instance.
+        
+        A string `seq` is first converted to a tuple. Raises ValueError if `r` is negative.
+        """
+        super().__init__(seq, len(seq) if r is None else r)
     
-    def _seqtools_reversed(self):
-        raise NotImplementedError
+    ##########
+    # Length #
+    ##########
     
-    def __repr__(self):
-        raise NotImplementedError
+    def _length(self):
+        """
+        Return n! / (n - r)!, or 0 if r > n.
+        
+        >>> Permutations(range(5), 3).len(), Permutations(range(5), 6).len(), Permutations(()).len()
+        (60, 0, 1)
+        
+        >>> Permutations(range(25)).len()
+        15511210043330985984000000
+        """
+        return math.perm(self._n, self._r)
+    
+    ###############
+    # Item access #
+    ###############
+    
+    def _item(self, i):
+        return tuple(map(self._seq.__getitem__, self._unrank(i)))
+    
+    def _unrank(self, i):
+        """
+        Return the positions `p` of the `i`th permutation, as a list.
+        
+        Precondition: `0 <= i < self.len()`.
+        """
+        n, w = self._n, self._len
+        free = _FenwickTree(n)
+        positions = []
+        for k in range(self._r):
+            w //= n - k
+            d, i = divmod(i, w)
+            p = free.select(d)
+            free.take(p)
+            positions.append(p)
+        return positions
+        # Correctness argument: On entry to iteration k, `w` is w[k-1] (taking w[-1] = n! / (n-r)! = self._len),
+        # and w[k] = w[k-1] / (n-k). See the comment on ranking above.
+    
+    def _rank(self, positions):
+        """
+        Return the index of the permutation with positions `positions`.
+        
+        Precondition: `positions` is an r-permutation of `range(self._n)`.
+        """
+        n, w = self._n, self._len
+        free = _FenwickTree(n)
+        i = 0
+        for k, p in enumerate(positions):
+            w //= n - k
+            i += free.rank(p) * w
+            free.take(p)
+        return i
+    
+    def _state(self, i):
+        """
+        Return the state of the `i`th permutation: the pair of the list of its positions,
+        and a bytearray of length n flagging the positions it uses.
+        """
+        positions = self._unrank(i)
+        used = bytearray(self._n)
+        for p in positions:
+            used[p] = 1
+        return positions, used
+    
+    def _value(self, state):
+        return tuple(map(self._seq.__getitem__, state[0]))
+    
+    def _advance(self, state):
+        """Replace `state` by the state of the next permutation."""
+        positions, used = state
+        for k in reversed(range(self._r)):
+            used[positions[k]] = 0
+            q = used.find(0, positions[k] + 1)
+            if q != -1:
+                positions[k] = q
+                used[q] = 1
+                q = 0
+                for t in range(k + 1, self._r):
+                    q = used.find(0, q)
+                    positions[t] = q
+                    used[q] = 1
+                return
+        # Correctness argument: Position k is the last that can be replaced by a greater position not used before it,
+        # so the next permutation takes the least such position there, then the least unused positions in increasing order.
+        # Each position is released as the loop passes it, so `used` flags exactly the positions before k.
+    
+    def _retreat(self, state):
+        """Replace `state` by the state of the previous permutation."""
+        positions, used = state
+        for k in reversed(range(self._r)):
+            used[positions[k]] = 0
+            q = used.rfind(0, 0, positions[k])
+            if q != -1:
+                positions[k] = q
+                used[q] = 1
+                q = self._n
+                for t in range(k + 1, self._r):
+                    q = used.rfind(0, 0, q)
+                    positions[t] = q
+                    used[q] = 1
+                return
+        # Correctness argument: The mirror image of `_advance`.
+    
+    def _run_blocks(self, state):
+        """
+        Generate iterators that, chained together, produce the items of `self` from the one with state `state` onwards.
+        """
+        positions, used = state
+        seq, r = self._seq, self._r
+        yield (self._value(state),)
+        taken = bytearray(used)
+        for k in reversed(range(r)):
+            taken[positions[k]] = 0
+            prefix = tuple(map(seq.__getitem__, positions[:k]))
+            pool = [p for p in range(self._n) if not taken[p]]
+            later = pool[bisect.bisect_right(pool, positions[k]):]
+            if k == r - 1:
+                yield map(prefix.__add__, zip(map(seq.__getitem__, later)))
+                continue
+            for x in later:
+                others = [seq[p] for p in pool if p != x]
+                yield map((prefix + (seq[x],)).__add__, itertools.permutations(others, r - k - 1))
+        # Correctness argument: The items after the given one are those that first differ from it at some position k,
+        # by taking a greater position x there, taken with k decreasing and x increasing; the positions after k
+        # are then any permutation of the positions unused by the prefix and x, in lexicographic order.
+        # (At the last position there are no such positions, so the items for each x there are produced together.)
+    
+    #############
+    # Iteration #
+    #############
+    
+    def __iter__(self):
+        return itertools.permutations(self._seq, self._r)
+    
+    ##########
+    # Search #
+    ##########
+    
+    def _claims(self, item):
+        """
+        Pair each element of `item` with the positions of the input that it could occupy.
+        
+        Postcondition: Yields, for each element `elem` of `item` in turn, a pair `(occ, j)`, where `occ` is the
+            increasing list of positions of `elem` in the input, and `j` is the number of earlier elements of `item`
+            equal to `elem`, each of which claims one of those positions.
+        """
+        claimed = {}
+        for elem in item:
+            occ = self._occurrences(elem)
+            if not occ:
+                yield occ, 0
+                continue
+            j = claimed.get(occ[0], 0)
+            claimed[occ[0]] = j + 1
+            yield occ, j
+        # Equal elements have the same list of occurrences, so they are told apart by their first occurrence,
+        # which works whether or not they are hashable.
+    
+    def __contains__(self, item):
+        """
+        Return `item in self`.
+        
+        Raises TypeError if `item` is not a tuple. Otherwise, returns True if `item` has length r, and each of its
+        elements occurs in the input at least as many times as it occurs in `item`.
+        
+        Examples:
+            >>> ('B', 'A', 'A') in Permutations('ABA')
+            True
+            
+            >>> ('B', 'B', 'A') in Permutations('ABA')
+            False
+        """
+        if not isinstance(item, tuple):
+            raise TypeError("'in <{}>' requires tuple as left operand, not {}".format(type(self).__name__, type(item).__name__))
+        if len(item) != self._r or self._len == 0:
+            return False
+        return all(j < len(occ) for occ, j in self._claims(item))
+        # Correctness argument: A multiset check, since by definition the items of `self` are exactly the tuples
+        # of length r whose elements, counted with multiplicity, can be drawn from the input without replacement.
+    
+    def index(self, item):
+        """
+        Return the index of the first occurrence of `item` in `self`. Raise ValueError if `item` is not present.
+        """
+        if not isinstance(item, tuple) or len(item) != self._r or self._len == 0:
+            raise ValueError("Permutations.index(x): x = {} not in Permutations".format(item))
+        positions = []
+        for occ, j in self._claims(item):
+            if j >= len(occ):
+                raise ValueError("Permutations.index(x): x = {} not in Permutations".format(item))
+            positions.append(occ[j])
+        return self._rank(positions)
+        # Correctness argument: `item` occurs at each permutation of positions holding its elements, and the first
+        # such permutation is the lexicographically least. That one takes the earliest position of each element
+        # not claimed by an earlier equal element: Taking any later one would give a greater permutation,
+        # and leaves the same positions available for the remaining elements.
+    
+    def count(self, item):
+        """
+        Count the number of occurrences of `item` in `self`.
+        
+        >>> Permutations('AABBB', 3).count(('B', 'A', 'B'))
+        12
+        """
+        if not isinstance(item, tuple) or len(item) != self._r or self._len == 0:
+            return 0
+        ways = 1
+        for occ, j in self._claims(item):
+            ways *= max(len(occ) - j, 0)
+            if ways == 0:
+                return 0
+        return ways
+        # Correctness argument: Each element of `item` can occupy any position holding it that is not claimed by
+        # an earlier equal element, so an element occurring c times in the input and m times in `item` contributes
+        # the falling factorial c * (c-1) * ... * (c-m+1) ways.
+    
+    ##########
+    # Slices #
+    ##########
+    
+    class Slice(_IncrementalSlice):
+        __slots__ = ()
+
+def _comb_unrank(n, r, i):
+    """
+    Return the positions of the `i`th `r`-combination of `range(n)`, in lexicographic order, as a list.
+    
+    Precondition: `0 <= i < math.comb(n, r)`.
+    """
+    c = math.comb(n, r) - 1 - i
+    positions = []
+    x = n
+    for m in range(r, 0, -1):
+        lo, hi = m - 1, x - 1
+        while lo < hi: # Binary search for the greatest `x` in `[lo, hi]` with `math.comb(x, m) <= c`.
+            mid = (lo + hi + 1) // 2
+            if math.comb(mid, m) <= c:
+                lo = mid
+            else:
+                hi = mid - 1
+        x = lo
+        c -= math.comb(x, m)
+        positions.append(n - 1 - x)
+    return positions
+    # Correctness argument: By `_comb_rank`, the complementary rank `c` of positions p[0] < ... < p[r-1] is
+    # math.comb(x[0], r) + ... + math.comb(x[r-1], 1), where x[k] = n - 1 - p[k] strictly decreases from below n.
+    # Every c in [0, math.comb(n, r)) has exactly one such representation (its combinadic), whose terms are found
+    # greedily, largest first: For each term, `math.comb(m - 1, m) == 0 <= c`, so the search always succeeds.
+
+def _comb_rank(n, r, positions):
+    """
+    Return the index of the `r`-combination of `range(n)` with increasing positions `positions`, in lexicographic order.
+    """
+    return math.comb(n, r) - 1 - sum(math.comb(n - 1 - p, r - k) for k, p in enumerate(positions))
+    # Correctness argument: Reversing the order on combinations, and complementing each position p to x = n - 1 - p,
+    # takes lexicographic order to colexicographic order on the decreasing tuples x[0] > ... > x[r-1],
+    # in which the tuples preceding x are those that first differ from it at some position k, by being smaller there.
+    # There are math.comb(x[k], r - k) of those for each k, as their positions k, ..., r-1 are any r - k of range(x[k]).
+
+class Combinations(_Combinatoric):
+    """
+    Precondition : `seq` is a sequence, and `r` is a nonnegative integer.
+    Postcondition: `Combinations(seq, r)` is the sequence of the `r`-length subsequences of `seq`, in the order produced by
+    `itertools.combinations(seq, r)`: the increasing `r`-tuples of positions of `seq`, in lexicographic order.
+    Elements are treated as unique based on their positions, not their values, so if `seq` has repeated elements,
+    so does `self`. If `r > len(seq)`, `self` is empty. A string `seq` is treated as a sequence of individual characters.
+    
+    Standard warning about combinatoric sequences: Providing mutable inputs and then mutating them may result in undefined behavior.
+    In particular, `seq` is frozen; see `_Combinatoric`.
+    
+    Items are computed directly from their indices by unranking in the combinatorial number system, in O(r log n) binomial
+    coefficients for `n = len(seq)`, and `index` ranks in O(r) binomial coefficients, so `self` can be entered at any point
+    without iterating up to it, e.g. to split it into ranges of indices for separate workers.
+    
+    Examples:
+        >>> C = Combinations('ABCDE', 3)
+        >>> len(C), C[0], C[4], C[-1]
+        (10, ('A', 'B', 'C'), ('A', 'C', 'E'), ('C', 'D', 'E'))
+        
+        >>> list(C) == list(itertools.combinations('ABCDE', 3))
+        True
+        
+        >>> C.index(('B', 'C', 'E')), ('C', 'B', 'E') in C
+        (7, False)
+        
+        >>> C = Combinations(range(1000), 500)
+        >>> len(str(C.len())) # Digits in the length.
+        300
+        
+        >>> C.index(C[10**299]) == 10**299
+        True
+    """
+    
+    # Abstraction function: the pair (s, r) represents the sequence of r-combinations of s (see `_Combinatoric`).
+    #   The item at index i is (s[p[0]], ..., s[p[r-1]]), where p = _comb_unrank(n, r, i), n = len(s).
+    
+    __slots__ = ()
     
     ##########
     # Length #
     ##########
     
-    def len(self):
-        raise NotImplementedError
-    def __len__(self):
-        return self.len()
+    def _length(self):
+        """Return the binomial coefficient `n choose r`, which is 0 if r > n."""
+        return math.comb(self._n, self._r)
     
     ###############
     # Item access #
     ###############
     
-    def __getitem__(self, index):
-        raise NotImplementedError
+    def _item(self, i):
+        return self._value(self._state(i))
+    
+    def _state(self, i):
+        """Return the increasing list of positions of the `i`th item."""
+        return _comb_unrank(self._n, self._r, i)
+    
+    def _value(self, state):
+        return tuple(map(self._seq.__getitem__, state))
+    
+    def _advance(self, state):
+        """Replace the increasing positions `state` by those of the next item."""
+        k, top = self._r - 1, self._n - self._r
+        while state[k] == top + k:
+            k -= 1
+        state[k:] = range(state[k] + 1, state[k] + 1 + self._r - k)
+        # Correctness argument: As in `itertools.combinations`: Positions after `k` are at their maximum,
+        # so the next item increments position `k`, then takes the least increasing completion.
+    
+    def _retreat(self, state):
+        """Replace the increasing positions `state` by those of the previous item."""
+        k = self._r - 1
+        while state[k] == (state[k - 1] + 1 if k else 0):
+            k -= 1
+        state[k] -= 1
+        state[k + 1:] = range(self._n - self._r + k + 1, self._n)
+        # Correctness argument: The mirror image of `_advance`: Positions after `k` are at their minimum
+        # (one past the position before them), so the previous item decrements position `k`, then takes
+        # the greatest completion.
+    
+    def _run_blocks(self, state):
+        """
+        Generate iterators that, chained together, produce the items of `self` from the one with state `state` onwards.
+        """
+        seq, r = self._seq, self._r
+        yield (self._value(state),)
+        for k in reversed(range(r)):
+            prefix = self._value(state[:k])
+            yield map(prefix.__add__, itertools.combinations(map(seq.__getitem__, range(state[k] + 1, self._n)), r - k))
+        # Correctness argument: The items after the given one are those that first differ from it at some position k,
+        # by taking a greater position there, taken with k decreasing; their positions from k onwards are then any
+        # increasing tuple of positions after `state[k]`, in lexicographic order.
     
     #############
     # Iteration #
     #############
     
     def __iter__(self):
-        raise NotImplementedError
-    def __reversed__(self):
-        raise NotImplementedError
+        return itertools.combinations(self._seq, self._r)
     
     ##########
     # Search #
     ##########
     
+    def _embed(self, item):
+        """
+        Return the lexicographically least increasing list of positions of the input holding the elements of `item`,
+        in turn, or None if there is none.
+        """
+        positions, p = [], -1
+        for elem in item:
+            occ = self._occurrences(elem)
+            j = bisect.bisect_right(occ, p)
+            if j == len(occ):
+                return None
+            p = occ[j]
+            positions.append(p)
+        return positions
+        # Correctness argument: Each element takes its earliest occurrence after the position of the previous element.
+        # Taking a later one would give a greater list, and leave fewer positions available for the remaining elements.
+    
     def __contains__(self, item):
-        raise NotImplementedError
+        """
+        Return `item in self`.
+        
+        Raises TypeError if `item` is not a tuple. Otherwise, returns True if `item` has length r, and its elements
+        occur in the input in the same order as in `item`.
+        
+        Examples:
+            >>> ('A', 'C') in Combinations('ABCA', 2), ('C', 'B') in Combinations('ABCA', 2)
+            (True, False)
+        """
+        if not isinstance(item, tuple):
+            raise TypeError("'in <{}>' requires tuple as left operand, not {}".format(type(self).__name__, type(item).__name__))
+        if len(item) != self._r or self._len == 0:
+            return False
+        return self._embed(item) is not None
     
-    def index(self, item): #, start, stop):
-        raise NotImplementedError
+    def index(self, item):
+        """
+        Return the index of the first occurrence of `item` in `self`. Raise ValueError if `item` is not present.
+        """
+        positions = None
+        if isinstance(item, tuple) and len(item) == self._r and self._len:
+            positions = self._embed(item)
+        if positions is None:
+            raise ValueError("Combinations.index(x): x = {} not in Combinations".format(item))
+        return _comb_rank(self._n, self._r, positions)
     
     def count(self, item):
-        raise NotImplementedError
+        """
+        Count the number of occurrences of `item` in `self`.
+        
+        >>> Combinations('ABAB', 2).count(('A', 'B'))
+        3
+        """
+        if not isinstance(item, tuple) or len(item) != self._r or self._len == 0:
+            return 0
+        prev_occ, ways = [-1], [1]
+        for elem in item:
+            occ = self._occurrences(elem)
+            before = list(itertools.accumulate(ways, initial=0))
+            ways = [before[bisect.bisect_left(prev_occ, p)] for p in occ]
+            prev_occ = occ
+        return sum(ways)
+        # Correctness argument: After each iteration, `ways[j]` counts the increasing lists of positions holding the
+        # elements of `item` so far, in turn, and ending at `occ[j]`: Each extends one of the lists counted by
+        # the previous `ways` that ends before `occ[j]`, and `before[t]` sums the first t of those.
+        # Initially, the empty list counts as ending at position -1.
+    
+    ##########
+    # Slices #
+    ##########
+    
+    class Slice(_IncrementalSlice):
+        __slots__ = ()
 
-class CombinationsWithReplacement(SeqReversible):
-    ################
-    # Construction #
-    ################
+class CombinationsWithReplacement(_Combinatoric):
+    """
+    Precondition : `seq` is a sequence, and `r` is a nonnegative integer.
+    Postcondition: `CombinationsWithReplacement(seq, r)` is the sequence of the `r`-length subsequences of `seq`
+    allowing individual elements to be repeated, in the order produced by `itertools.combinations_with_replacement(seq, r)`:
+    the nondecreasing `r`-tuples of positions of `seq`, in lexicographic order. Elements are treated as unique based on
+    their positions, not their values, so if `seq` has repeated elements, so does `self`.
+    A string `seq` is treated as a sequence of individual characters.
     
-    def __iter__(self, seq, r):
-        raise NotImplementedError
+    Standard warning about combinatoric sequences: Providing mutable inputs and then mutating them may result in undefined behavior.
+    In particular, `seq` is frozen; see `_Combinatoric`.
     
-    def _seqtools_reversed(self):
-        raise NotImplementedError
+    Adding k to the kth position turns the nondecreasing tuples of positions of `seq` into the increasing tuples
+    of positions of a sequence of length `len(seq) + r - 1`, preserving their order, so items are unranked and ranked
+    in the combinatorial number system as for `Combinations`. Slices are iterated by stepping from each item to the next.
     
-    def __repr__(self):
-        raise NotImplementedError
+    Examples:
+        >>> C = CombinationsWithReplacement('ABC', 2)
+        >>> len(C), C[0], C[4], C[-1]
+        (6, ('A', 'A'), ('B', 'C'), ('C', 'C'))
+        
+        >>> list(C) == list(itertools.combinations_with_replacement('ABC', 2))
+        True
+        
+        >>> C.index(('B', 'B')), ('B', 'A') in C
+        (3, False)
+        
+        >>> list(C[1::2])
+        [('A', 'B'), ('B', 'B'), ('C', 'C')]
+        
+        >>> C = CombinationsWithReplacement(range(10**6), 5) # Monomials of degree 5 in a million variables.
+        >>> C.len(), C[10**25]
+        (8333416666958333750000200000, (240, 29864, 197765, 444703, 469598))
+    """
+    
+    # Abstraction function: the pair (s, r) represents the sequence of r-combinations with replacement of s
+    #   (see `_Combinatoric`). The item at index i is (s[q[0]], ..., s[q[r-1]]), where q = self._state(i),
+    #   which is p[k] - k for k in range(r), where p = _comb_unrank(N, r, i).
+    # Here N = max(n + r - 1, 0), n = len(s): the clamp at 0 only matters when n = 0, and then the length math.comb(N, r)
+    #   is correctly 1 if r = 0 and 0 otherwise.
+    
+    __slots__ = ()
     
     ##########
     # Length #
     ##########
     
-    def len(self):
-        raise NotImplementedError
-    def __len__(self):
-        return self.len()
+    def _length(self):
+        """Return the multiset coefficient `(n + r - 1) choose r`."""
+        return math.comb(self._virtual_n(), self._r)
+    
+    def _virtual_n(self):
+        return max(self._n + self._r - 1, 0)
     
     ###############
     # Item access #
     ###############
     
-    def __getitem__(self, index):
-        raise NotImplementedError
+    def _item(self, i):
+        return self._value(self._state(i))
+    
+    def _state(self, i):
+        """Return the nondecreasing list of positions of the `i`th item."""
+        return [p - k for k, p in enumerate(_comb_unrank(self._virtual_n(), self._r, i))]
+    
+    def _value(self, state):
+        return tuple(map(self._seq.__getitem__, state))
+    
+    def _advance(self, state):
+        """Replace the nondecreasing positions `state` by those of the next item."""
+        k = self._r - 1
+        while state[k] == self._n - 1:
+            k -= 1
+        state[k:] = [state[k] + 1] * (self._r - k)
+        # Correctness argument: As in `itertools.combinations_with_replacement`: Positions after `k` are at their maximum,
+        # so the next item increments position `k`, then takes the least nondecreasing completion.
+    
+    def _retreat(self, state):
+        """Replace the nondecreasing positions `state` by those of the previous item."""
+        k = self._r - 1
+        while state[k] == (state[k - 1] if k else 0):
+            k -= 1
+        state[k] -= 1
+        state[k + 1:] = [self._n - 1] * (self._r - k - 1)
+        # Correctness argument: The mirror image of `_advance`: Positions after `k` are at their minimum
+        # (equal to the position before them), so the previous item decrements position `k`, then takes
+        # the greatest completion.
+    
+    def _run_blocks(self, state):
+        """
+        Generate iterators that, chained together, produce the items of `self` from the one with state `state` onwards.
+        """
+        seq, r = self._seq, self._r
+        yield (self._value(state),)
+        for k in reversed(range(r)):
+            prefix = self._value(state[:k])
+            yield map(prefix.__add__,
+                      itertools.combinations_with_replacement(map(seq.__getitem__, range(state[k] + 1, self._n)), r - k))
+        # Correctness argument: As for `Combinations._run_blocks`, with nondecreasing tuples of positions.
     
     #############
     # Iteration #
     #############
     
     def __iter__(self):
-        raise NotImplementedError
-    def __reversed__(self):
-        raise NotImplementedError
+        return itertools.combinations_with_replacement(self._seq, self._r)
     
     ##########
     # Search #
     ##########
     
+    def _embed(self, item):
+        """
+        Return the lexicographically least nondecreasing list of positions of the input holding the elements of `item`,
+        in turn, or None if there is none.
+        """
+        positions, p = [], 0
+        for elem in item:
+            occ = self._occurrences(elem)
+            j = bisect.bisect_left(occ, p)
+            if j == len(occ):
+                return None
+            p = occ[j]
+            positions.append(p)
+        return positions
+        # Correctness argument: As for `Combinations._embed`, except that an element may share its position with the previous one.
+    
     def __contains__(self, item):
-        raise NotImplementedError
+        """
+        Return `item in self`.
+        
+        Raises TypeError if `item` is not a tuple. Otherwise, returns True if `item` has length r, and its elements
+        occur in the input in the same order as in `item`, with repeated elements allowed to share a position.
+        """
+        if not isinstance(item, tuple):
+            raise TypeError("'in <{}>' requires tuple as left operand, not {}".format(type(self).__name__, type(item).__name__))
+        if len(item) != self._r or self._len == 0:
+            return False
+        return self._embed(item) is not None
     
-    def index(self, item): #, start, stop):
-        raise NotImplementedError
+    def index(self, item):
+        """
+        Return the index of the first occurrence of `item` in `self`. Raise ValueError if `item` is not present.
+        """
+        positions = None
+        if isinstance(item, tuple) and len(item) == self._r and self._len:
+            positions = self._embed(item)
+        if positions is None:
+            raise ValueError("CombinationsWithReplacement.index(x): x = {} not in CombinationsWithReplacement".format(item))
+        return _comb_rank(self._virtual_n(), self._r, [p + k for k, p in enumerate(positions)])
     
     def count(self, item):
-        raise NotImplementedError
+        """
+        Count the number of occurrences of `item` in `self`.
+        
+        >>> CombinationsWithReplacement('ABAB', 2).count(('A', 'B'))
+        3
+        """
+        if not isinstance(item, tuple) or len(item) != self._r or self._len == 0:
+            return 0
+        prev_occ, ways = [0], [1]
+        for elem in item:
+            occ = self._occurrences(elem)
+            upto = list(itertools.accumulate(ways, initial=0))
+            ways = [upto[bisect.bisect_right(prev_occ, p)] for p in occ]
+            prev_occ = occ
+        return sum(ways)
+        # Correctness argument: As for `Combinations.count`, except that each list extends those ending at or before
+        # `occ[j]`. Initially, the empty list counts as ending at position 0, which is at or before every position.
+    
+    ##########
+    # Slices #
+    ##########
+    
+    class Slice(_IncrementalSlice):
+        __slots__ = ()
 
-class Partitions(SeqReversible):
-    ################
-    # Construction #
-    ################
+class Partitions(_Combinatoric):
+    """
+    Precondition : `seq` is a sequence, and `r` is a nonnegative integer.
+    Postcondition: `Partitions(seq, r)` is the sequence of the partitions of the positions of `seq` into `r` nonempty blocks,
+    each item being the tuple of the blocks of a partition, and each block the tuple of the elements of `seq` at its positions.
+    Within a partition, each block lists its elements in order of position, and the blocks are ordered by their first positions.
+    Elements are treated as unique based on their positions, not their values, so if `seq` has repeated elements,
+    so does `self`. A string `seq` is treated as a sequence of individual characters.
     
-    def __iter__(self, seq, n, r):
-        raise NotImplementedError
+    Standard warning about combinatoric sequences: Providing mutable inputs and then mutating them may result in undefined behavior.
+    In particular, `seq` is frozen; see `_Combinatoric`.
     
-    def _seqtools_reversed(self):
-        raise NotImplementedError
+    Canonical order: A partition is encoded by its restricted growth string (RGS), the list `a` of the numbers of the blocks
+    containing each position, counting from 0, so that `a[0] == 0` and each `a[p] <= max(a[:p]) + 1`.
+    Partitions are ordered lexicographically by their RGSs. The length of `self` is the Stirling number of the second kind
+    S(n, r), for `n = len(seq)`. Items are unranked and ranked in O(n) arithmetic operations by counting the completions
+    of each prefix of an RGS in a table computed at construction, so `self` can be entered at any point.
+    Slices are iterated by stepping from each RGS to the next.
     
-    def __repr__(self):
-        raise NotImplementedError
+    Examples:
+        >>> P = Partitions('ABCD', 2)
+        >>> len(P), P[0], P[-1]
+        (7, (('A', 'B', 'C'), ('D',)), (('A',), ('B', 'C', 'D')))
+        
+        >>> list(P[2:6])
+        [(('A', 'B'), ('C', 'D')), (('A', 'C', 'D'), ('B',)), (('A', 'C'), ('B', 'D')), (('A', 'D'), ('B', 'C'))]
+        
+        >>> P.index((('A', 'D'), ('B', 'C'))), (('B', 'C'), ('A', 'D')) in P
+        (5, False)
+        
+        >>> Partitions(range(10), 3).len() # S(10, 3)
+        9330
+    """
+    
+    # Abstraction function: the pair (s, r) represents the sequence of partitions of s into r blocks (see `_Combinatoric`).
+    #   The item at index i has the RGS a = self._state(i), and its block k lists s[p] for the positions p with a[p] == k.
+    # Cached table (valid under the frozen-input contract, recomputed by `refresh`):
+    #   _ways[p][m] = number of ways to complete an RGS whose first p entries use m distinct blocks,
+    #                 so that it uses exactly r blocks, for 0 <= p <= n and 0 <= m <= r + 1.
+    #   Position p can join one of the m existing blocks, or open block m, so
+    #     _ways[p][m] = m * _ways[p+1][m] + _ways[p+1][m+1],
+    #   with _ways[n][m] = 1 if m == r, else 0; and the length is _ways[0][0].
+    
+    __slots__ = ('_ways',)
     
     ##########
     # Length #
     ##########
     
-    def len(self):
-        raise NotImplementedError
-    def __len__(self):
-        return self.len()
+    def _length(self):
+        """Return the Stirling number of the second kind S(n, r), building the table of completions on the way."""
+        n, r = self._n, self._r
+        ways = [[0] * (r + 2) for _ in range(n + 1)]
+        ways[n][r] = 1
+        for p in reversed(range(n)):
+            below, row = ways[p + 1], ways[p]
+            for m in range(min(p, r) + 1):
+                row[m] = m * below[m] + below[m + 1]
+        self._ways = ways
+        return ways[0][0]
+        # Entries with m > p stay 0, as the first p entries of an RGS use at most p blocks, so they are never read.
     
     ###############
     # Item access #
     ###############
     
-    def __getitem__(self, index):
-        raise NotImplementedError
+    def _item(self, i):
+        return self._value(self._state(i))
+    
+    def _state(self, i):
+        """Return the RGS of the `i`th partition, as a list."""
+        rgs, m = [], 0
+        for p in range(self._n):
+            w = self._ways[p + 1][m]
+            if i < m * w:
+                b, i = divmod(i, w)
+                rgs.append(b)
+            else:
+                i -= m * w
+                rgs.append(m)
+                m += 1
+        return rgs
+        # Correctness argument: The RGSs extending the prefix so far come in blocks ordered by the next entry:
+        # one block of `w` for each existing block b < m, then `self._ways[p + 1][m + 1]` for opening block m.
+    
+    def _rank(self, rgs):
+        """Return the index of the partition with RGS `rgs`."""
+        i, m = 0, 0
+        for p, b in enumerate(rgs):
+            w = self._ways[p + 1][m]
+            if b < m:
+                i += b * w
+            else:
+                i += m * w
+                m += 1
+        return i
+    
+    def _value(self, rgs):
+        blocks = [[] for _ in range(self._r)]
+        for x, b in zip(self._seq, rgs):
+            blocks[b].append(x)
+        return tuple(map(tuple, blocks))
+    
+    def _advance(self, rgs):
+        """Replace `rgs` by the RGS of the next partition."""
+        n, r = self._n, self._r
+        top = list(itertools.accumulate(rgs, max))
+        p = n - 1
+        while rgs[p] == min(top[p - 1] + 1, r - 1):
+            p -= 1
+        rgs[p] += 1
+        m = max(top[p - 1], rgs[p]) + 1
+        fill = n - 1 - p - (r - m) # Zeros before the blocks still to be opened.
+        rgs[p + 1:] = [0] * fill + list(range(m, r))
+        # Correctness argument: Position p is the last that can be incremented, so the next RGS increments it,
+        # then takes the least completion using exactly r blocks: as many zeros as possible, then the unopened blocks in order.
+        # Incrementing never decreases the number of blocks opened, so that completion exists (`fill >= 0`).
+        # Position 0 always holds 0, and `top[-1]` is then never read, since the loop stops at the last position
+        # that can be incremented, which is positive unless `self` has no next item.
+    
+    def _retreat(self, rgs):
+        """Replace `rgs` by the RGS of the previous partition."""
+        n, r = self._n, self._r
+        top = list(itertools.accumulate(rgs, max))
+        p = n - 1
+        while rgs[p] == 0 or max(top[p - 1], rgs[p] - 1) + 1 + (n - 1 - p) < r:
+            p -= 1
+        rgs[p] -= 1
+        m = max(top[p - 1], rgs[p]) + 1
+        for q in range(p + 1, n):
+            rgs[q] = min(m, r - 1)
+            m = max(m, rgs[q] + 1)
+        # Correctness argument: Position p is the last whose entry can be decremented while still allowing r blocks
+        # to be opened by the end (decrementing it further could only make that harder). The previous RGS decrements it,
+        # then takes the greatest completion, opening a new block wherever possible.
     
     #############
     # Iteration #
     #############
     
     def __iter__(self):
-        raise NotImplementedError
-    def __reversed__(self):
-        raise NotImplementedError
+        if self._len == 0:
+            return
+        rgs = self._state(0)
+        yield self._value(rgs)
+        for _ in range(self._len - 1):
+            self._advance(rgs)
+            yield self._value(rgs)
     
     ##########
     # Search #
     ##########
     
+    def _moves(self, item, p, state):
+        """
+        Yield the pairs `(k, new_state)` for each block `k` of `item` that can receive the element at position `p`
+        in assignment state `state` (see `_match`), in increasing order of `k`.
+        """
+        x = self._seq[p]
+        for k, c in enumerate(state):
+            block = item[k]
+            if c < len(block) and (block[c] is x or block[c] == x):
+                yield k, state[:k] + (c + 1,) + state[k + 1:]
+            if c == 0:
+                break # Blocks are opened in order, so only the first unopened block can be opened next.
+    
+    def _match(self, item):
+        """
+        Count the ways of assigning the positions of the input, in turn, to the blocks of `item`,
+        so that each block receives its elements in order and the blocks are opened in order.
+        
+        Postcondition: Returns a dict mapping each state reachable by assigning positions 0, ..., p-1 (for some p)
+            to its number of completions, where a state is the tuple of the numbers of elements each block has received;
+            or None if `item` is not a tuple of r nonempty tuples with n elements in all.
+        """
+        if (len(item) != self._r or not all(isinstance(block, tuple) and block for block in item)
+                or sum(map(len, item)) != self._n):
+            return None
+        layers = [{(0,) * self._r}]
+        for p in range(self._n):
+            layers.append({new for state in layers[p] for _, new in self._moves(item, p, state)})
+        ahead = dict.fromkeys(layers[self._n], 1)
+        for p in reversed(range(self._n)):
+            for state in layers[p]:
+                ahead[state] = sum(ahead[new] for _, new in self._moves(item, p, state))
+        return ahead
+        # Correctness argument: The assignments are exactly the RGSs of the partitions equal to `item`.
+        # Each state at step p has received p elements in all, so the only state at step n has filled every block,
+        # and has one (empty) completion.
+    
     def __contains__(self, item):
-        raise NotImplementedError
+        """
+        Return `item in self`.
+        
+        Raises TypeError if `item` is not a tuple.
+        """
+        if not isinstance(item, tuple):
+            raise TypeError("'in <{}>' requires tuple as left operand, not {}".format(type(self).__name__, type(item).__name__))
+        return self.count(item) > 0
     
-    def index(self, item): #, start, stop):
-        raise NotImplementedError
+    def index(self, item):
+        """
+        Return the index of the first occurrence of `item` in `self`. Raise ValueError if `item` is not present.
+        """
+        ahead = self._match(item) if isinstance(item, tuple) and self._len else None
+        state = (0,) * self._r
+        if not ahead or not ahead[state]:
+            raise ValueError("Partitions.index(x): x = {} not in Partitions".format(item))
+        rgs = []
+        for p in range(self._n):
+            k, state = next((k, new) for k, new in self._moves(item, p, state) if ahead[new])
+            rgs.append(k)
+        return self._rank(rgs)
+        # Correctness argument: `_moves` yields blocks in increasing order, so this takes the least RGS of `item`.
     
     def count(self, item):
-        raise NotImplementedError
+        """
+        Count the number of occurrences of `item` in `self`.
+        
+        >>> Partitions('AAAB', 2).count((('A', 'A'), ('A', 'B')))
+        2
+        """
+        if not isinstance(item, tuple) or self._len == 0:
+            return 0
+        ahead = self._match(item)
+        return ahead[(0,) * self._r] if ahead else 0
+    
+    ##########
+    # Slices #
+    ##########
+    
+    class Slice(_IncrementalSlice):
+        __slots__ = ()
 
 if __name__ == "__main__":
     import doctest
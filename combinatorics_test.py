@@ -18,9 +18,10 @@
 
 """Unit tests for the `combinatorics` module.."""
 
-import unittest, itertools
-#import combinatorics
-from combinatorics import Product
+import unittest, itertools, bisect, math
+from unittest import mock
+import combinatorics
+from combinatorics import Product, Permutations, Combinations, CombinationsWithReplacement, Partitions
 from reversed import Reversed
 
 class TestProduct(unittest.TestCase):
@@ -113,6 +114,26 @@ class TestProduct(unittest.TestCase):
     def test_len_huge(self):
         huge = self._testSubjects[-1]
         self.assertEqual(huge.len(), 10**60)
+
+    def test_slots(self):
+        # Products and their slices carry no instance dictionary.
+        P = Product("AB", [0, 1, 2])
+        for instance in (P, P[1:-1:2]):
+            with self.subTest(instance=instance):
+                self.assertIsInstance(instance, (Product, Product.Slice))
+                self.assertFalse(hasattr(instance, '__dict__'))
+
+    def test_refresh(self):
+        # Factor lengths are cached at construction until explicitly refreshed.
+        factor = [0, 1]
+        P = Product("AB", factor)
+        factor.append(2)
+        self.assertEqual(P.len(), 4)
+        P.refresh()
+        self.assertEqual(P.len(), 6)
+        self.assertEqual(list(P), list(itertools.product("AB", factor)))
+        self.assertEqual(P[-1], ('B', 2))
+        self.assertEqual(list(P[1::2]), list(itertools.product("AB", factor))[1::2])
     
     ###############
     # Item access #
@@ -140,7 +161,62 @@ class TestProduct(unittest.TestCase):
             with self.subTest(P=P, index=index):
                 with self.assertRaises(IndexError):
                     P[index]
-                    
+
+    def test_take(self):
+        """Test that `Product.take` agrees with subscripting one index at a time."""
+        factors = ("ABC", range(4), (False, True))
+        P = Product(*factors)
+        reference = tuple(itertools.product(*factors))
+        indices = [5, 0, -1, 23, -24, 7, 7]
+        expected = [reference[i] for i in indices]
+
+        # With NumPy if available, then again with the pure Python fallback.
+        for numpy_ in (combinatorics.numpy, None):
+            with self.subTest(numpy=numpy_ is not None), mock.patch.object(combinatorics, 'numpy', numpy_):
+                self.assertEqual(P.take(indices), expected)
+                self.assertEqual(P.take([]), [])
+                self.assertEqual([tuple(map(int, row)) for row in P.take(indices, index_matrix=True)],
+                                 [P._multi_index(i % 24) for i in indices])
+                for bad_indices in ([24], [0, -25]):
+                    with self.assertRaises(IndexError):
+                        P.take(bad_indices)
+                self.assertEqual(Product().take([0, -1]), [(), ()])
+
+        # Indices too large for int64 fall back on big-integer arithmetic.
+        huge = self._testSubjects[-1]
+        big = 785979398597554673765267388740066098873495547967682668161773
+        self.assertEqual(huge.take([big, -1]), [huge[big], huge[-1]])
+        
+        # Factors with their own `take` method gather through it.
+        nested = Product(P[3:20:2], Reversed(range(5)), "xy")
+        reference = list(itertools.product(list(P)[3:20:2], range(4, -1, -1), "xy"))
+        self.assertEqual(nested.take([0, 17, -1, 50]), [reference[i] for i in (0, 17, -1, 50)])
+
+    def test_sample(self):
+        """Test that `Product.sample` and `Product.random_iter` draw valid items reproducibly."""
+        P = Product("ABC", range(4), (False, True))
+        huge = self._testSubjects[-1]
+        for numpy_ in (combinatorics.numpy, None):
+            with self.subTest(numpy=numpy_ is not None), mock.patch.object(combinatorics, 'numpy', numpy_):
+                # Without replacement: distinct positions, so every item of a product of distinct elements is distinct.
+                self.assertEqual(sorted(P.sample(len(P), seed=1)), sorted(P))
+                self.assertEqual(len(set(huge.sample(100, seed=2))), 100)
+                self.assertEqual(P.sample(5, seed=3), P.sample(5, seed=3))
+                with self.assertRaises(ValueError):
+                    P.sample(len(P) + 1)
+                
+                # With replacement.
+                items = P.sample(100, replace=True, seed=4)
+                self.assertEqual(len(items), 100)
+                self.assertTrue(all(item in P for item in items))
+                self.assertTrue(all(item in huge for item in huge.sample(10, replace=True)))
+                self.assertEqual(Product().sample(2, replace=True), [(), ()])
+                
+                drawn = list(itertools.islice(P.random_iter(seed=5, batch=7), 20))
+                self.assertEqual(len(drawn), 20)
+                self.assertTrue(all(item in P for item in drawn))
+                self.assertEqual(drawn, list(itertools.islice(P.random_iter(seed=5, batch=7), 20)))
+    
     def test_slicing(self):
         """
         Test that Product instances produce slice objects that behave correctly.
@@ -182,6 +258,90 @@ class TestProduct(unittest.TestCase):
                         with self.subTest(pos=i):
                             self.assertEqual(x, y)
     
+    def test_slice_simplification(self):
+        """
+        Test that slices of Products are themselves Products whenever they are Cartesian products of slices of the factors.
+        """
+        factors = ("ABCD", range(6))
+        P = Product(*factors)
+        reference = tuple(itertools.product(*factors))
+        cases = ( # (slice, whether the result should be a Product)
+            (slice(None),         True), # Whole product
+            (slice(None, None, -1), True), # Reversed
+            (slice(6, 18),        True), # Aligned to boundaries of the first factor
+            (slice(7, 11),        True), # Within one block of the first factor
+            (slice(6, 18, 2),     True), # Step divides length of the last factor
+            (slice(1, None, 3),   True),
+            (slice(None, None, 12), True), # Step is a multiple of the stride of the first factor
+            (slice(-1, None, -6), True),
+            (slice(5, 6),         True), # Single item
+            (slice(2, 9),         False), # Crosses a factor boundary without being aligned to it
+            (slice(None, None, 4), False), # Step doesn't divide the length of the last factor
+            (slice(3, 3),         False), # Empty
+        )
+        for index, simplifies in cases:
+            with self.subTest(index=index):
+                sliceobj = P[index]
+                self.assertEqual(isinstance(sliceobj, Product), simplifies)
+                self.assertEqual(tuple(sliceobj), reference[index])
+                self.assertEqual(tuple(sliceobj[1::2]), reference[index][1::2])
+                self.assertEqual(tuple(sliceobj[::-1]), reference[index][::-1])
+        
+        # Sub-slices of general Product slices are simplified too.
+        self.assertIsInstance(P[1:23:2][3:9], Product)
+    
+    def test_where(self):
+        """Test that filtering factors of a Product selects the expected items, in order."""
+        factors = (range(6), "ABCA", (False, True))
+        P = Product(*factors)
+        reference = tuple(itertools.product(*factors))
+        is_even, not_a = (lambda x: x % 2 == 0), (lambda c: c != 'A')
+        cases = (
+            (P.where(0, is_even),                   lambda x: is_even(x[0])),
+            (P.where(-2, not_a),                    lambda x: not_a(x[1])),
+            (P.where({0: is_even, 1: not_a, 2: bool}), lambda x: is_even(x[0]) and not_a(x[1]) and x[2]),
+        )
+        for filtered, selects in cases:
+            expected = tuple(x for x in reference if selects(x))
+            with self.subTest(filtered=filtered):
+                self.assertIsInstance(filtered, Product)
+                self.assertEqual(len(filtered), len(expected))
+                self.assertEqual(tuple(filtered), expected)
+                self.assertEqual(tuple(filtered[1::3]), expected[1::3])
+                self.assertEqual(tuple(Reversed(filtered)), expected[::-1])
+                for item in expected[::5]:
+                    self.assertEqual(filtered.index(item), expected.index(item))
+        
+        # Composes with reversal.
+        self.assertEqual(tuple(Reversed(P).where(0, is_even)), tuple(x for x in reference[::-1] if is_even(x[0])))
+        
+        # Each predicate is called once per element of its factor.
+        calls = []
+        P.where(0, lambda x: calls.append(x) or True)
+        self.assertEqual(calls, list(range(6)))
+        
+        # Filtered range factors stay ranges while their remaining elements are evenly spaced.
+        self.assertEqual(P.where(0, is_even)._sequences[0], range(0, 6, 2))
+        self.assertEqual(P.where(0, lambda x: x > 9)._sequences[0], range(0))
+        self.assertEqual(P.where(0, lambda x: x in (1, 2, 4))._sequences[0], (1, 2, 4))
+        
+        # Slices with steps of 1 and -1 are filtered as slices of the filtered product.
+        for index in (slice(2, 9), slice(5, -7), slice(30, 3, -1), slice(None, None, -1), slice(4, 4)):
+            sliceobj = P[index]
+            expected = tuple(x for x in reference[index] if is_even(x[0]) and x[2])
+            with self.subTest(index=index):
+                filtered = sliceobj.where({0: is_even, 2: bool})
+                self.assertEqual(tuple(filtered), expected)
+                self.assertEqual(len(filtered), len(expected))
+        with self.assertRaises(ValueError):
+            P[1:40:3].where(0, is_even)
+        
+        with self.assertRaises(IndexError):
+            P.where(3, bool)
+        for args in ((0,), (0, None), (0, 'not callable'), ({0: None},), ({0: bool}, bool)):
+            with self.subTest(args=args), self.assertRaises(TypeError):
+                P.where(*args)
+    
     #############
     # Iteration #
     #############
@@ -207,6 +367,46 @@ class TestProduct(unittest.TestCase):
                     for got, expected in itertools.zip_longest(reversed(instance), reversed(reference), fillvalue=sentinel):
                         self.assertEqual(got, expected)
     
+    def test_slice_iter(self):
+        """
+        Test iteration over Product slices whose step sizes are, or are not, aligned to the strides of the factors.
+        """
+        factors = ("ABCD", (False, True), range(5), (None,), range(3))
+        product   = Product(*factors)
+        reference = tuple(itertools.product(*factors))
+        startstops = (None, 0, 1, -1, 7, -7, 50, -50, 119, 120, 999, -999)
+        steps = (1, -1, 3, -3, 15, -15, 30, -30, 2, -2, 7, -7, 200) # Strides are 30, 15, 3, 3, 1.
+        for sliceargs in itertools.product(startstops, startstops, steps):
+            index = slice(*sliceargs)
+            with self.subTest(index=index):
+                self.assertEqual(tuple(product[index]), reference[index])
+    
+    @unittest.skipIf(combinatorics.numpy is None, "requires NumPy")
+    def test_iter_arrays(self):
+        """Test that `iter_arrays` streams the multi-indices or values of Products and their slices in blocks."""
+        factors = ((10, 20, 30, 40), (0.5, 1.5), range(5, 0, -1))
+        product = Product(*factors)
+        reference = tuple(itertools.product(*factors))
+        for index in (slice(None), slice(3, None, 7), slice(None, None, -3), slice(5, 5)):
+            sliceobj = product[index]
+            for start, stop in ((None, None), (2, 9), (-5, None)):
+                expected = reference[index][start:stop]
+                with self.subTest(index=index, start=start, stop=stop):
+                    blocks = list(sliceobj.iter_arrays(4, start, stop))
+                    self.assertTrue(all(len(block) == 4 for block in blocks[:-1]))
+                    self.assertEqual([tuple(row) for block in blocks for row in block.tolist()],
+                                     [tuple(f.index(x) for f, x in zip(factors, item)) for item in expected])
+                    self.assertEqual([tuple(row) for block in sliceobj.iter_arrays(4, start, stop, values=True) for row in block.tolist()],
+                                     list(expected))
+        
+        # Products longer than int64 arithmetic allows.
+        huge = self._testSubjects[-1]
+        block = next(huge[10**59::-3].iter_arrays(2))
+        self.assertEqual([tuple(row) for row in block.tolist()], [huge._multi_index(10**59), huge._multi_index(10**59 - 3)])
+        
+        with self.assertRaises(TypeError):
+            next(Product("AB").iter_arrays(1, values=True))
+    
     ##########
     # Search #
     ##########
@@ -248,28 +448,369 @@ class TestProduct(unittest.TestCase):
                                 instance.index(item)
                         
                         self.assertEqual(instance.count(item), reference.count(item))
+    
+    def test_search_tables(self):
+        """Test searches through factor lookup tables, and the fallbacks for unhashable elements."""
+        factors = ("ABCA", ([0], [1], [0]), range(3), (1.0, True, 2))
+        reference = tuple(itertools.product(*factors))
+        items = (('A', [0], 2, 1), ('C', [1], 0, 2), ('D', [0], 0, 1), ('A', [2], 0, 1), ('B', [0], 3, True), ([], [0], 0, 2))
+        for prebuild_index in (False, True):
+            P = Product(*factors, prebuild_index=prebuild_index)
+            if prebuild_index:
+                self.assertTrue(P._tables[0] and P._tables[3])
+                self.assertFalse(P._tables[1] or P._tables[2]) # Unhashable elements; range
+            for item in items:
+                with self.subTest(prebuild_index=prebuild_index, item=item):
+                    self.assertEqual(item in P, item in reference)
+                    self.assertEqual(P.count(item), reference.count(item))
+                    if item in reference:
+                        self.assertEqual(P.index(item), reference.index(item))
+                    else:
+                        with self.assertRaises(ValueError):
+                            P.index(item)
+        
+        # Tables are discarded on refresh.
+        factor = [0, 1]
+        P = Product(factor)
+        self.assertNotIn((2,), P)
+        factor.append(2)
+        P.refresh()
+        self.assertEqual(P.index((2,)), 2)
+    
+    def test_bisect(self):
+        """Test lexicographic binary search over products of sorted factors, against `bisect` over explicit tuples."""
+        factors = ((0, 1, 3), "BDE", (0, 3, 3, 6)) # Repeated elements are allowed in the last factor only.
+        P = Product(*factors)
+        reference = tuple(itertools.product(*factors))
+        probes = ((), (1,), (2,), (4,), (1, 'D'), (1, 'C'), (3, 'E', 3), (3, 'E', 7), (0, 'A', 9), (1, 'D', 3, 0), (-1, 'Z'))
+        for item in probes:
+            with self.subTest(item=item):
+                self.assertEqual(P.bisect_left(item),  bisect.bisect_left(reference, item))
+                self.assertEqual(P.bisect_right(item), bisect.bisect_right(reference, item))
+        for lo, hi in ((probes[1], probes[6]), (probes[4], probes[5]), (probes[0], probes[3])):
+            with self.subTest(lo=lo, hi=hi):
+                self.assertEqual(tuple(P.range_query(lo, hi)), tuple(x for x in reference if lo <= x < hi))
+        
+        huge = self._testSubjects[-1]
+        self.assertEqual(huge.bisect_left((1, 2)), 10**54 + 2 * 10**48)
+        self.assertEqual(huge.range_query((5,), (5, 0, 3)).len(), 3 * 10**42)
+    
+    def test_slice_search(self):
+        """Test the search methods of Product slices, including over factors with repeated elements."""
+        factors = ((0,1,0,1), (0, 0, 0), (1, 2, 2))
+        product   = Product(*factors)
+        reference = tuple(itertools.product(*factors))
+        items = ((0, 0, 0), (0, 0, 1), (1, 0, 2), (3, 0, 1), (0, 0))
+        methods = (None, 1, 2, 3) # Each search method forced in turn, after the one chosen by cost.
+        choose = Product.Slice._method
+        for index, method in itertools.product((slice(1, None, 5), slice(-2, 3, -7), slice(5, 30, 2), slice(None, None, -4)), methods):
+            sliceobj, expected = product[index], reference[index]
+            self.assertIsInstance(sliceobj, Product.Slice) # Not simplified to a Product
+            for item in items:
+                with self.subTest(index=index, item=item, method=method), \
+                     mock.patch.object(Product.Slice, '_method', lambda self, *args: method or choose(self, *args)):
+                    self.assertEqual(item in sliceobj, item in expected)
+                    self.assertEqual(sliceobj.count(item), expected.count(item))
+                    for start, stop in ((0, None), (2, None), (1, -1), (-4, None)):
+                        if item in expected[start:stop]:
+                            self.assertEqual(sliceobj.index(item, start, stop), expected.index(item, *slice(start, stop).indices(len(expected))[:2]))
+                        else:
+                            with self.assertRaises(ValueError):
+                                sliceobj.index(item, start, stop)
+        
+        # Search takes time independent of the length of the slice.
+        huge = self._testSubjects[-1][3::7]
+        self.assertEqual(huge.index((0,) * 9 + (10,)), 1)
+        self.assertNotIn((0,) * 9 + (11,), huge)
+        self.assertEqual(huge.count((0,) * 9 + (73,)), 1)
+        
+        # Or of the number of places an item occurs in the base product.
+        repeated = Product([0] * 10**5, [0] * 10**5)
+        for index in (slice(None, None, 3), slice(-2, 10**7, -97), slice(5, -5, 10**5 + 1)):
+            sliceobj = repeated[index]
+            with self.subTest(index=index):
+                self.assertEqual(sliceobj.count((0, 0)), len(sliceobj))
+                self.assertEqual(sliceobj.index((0, 0), 7), 7)
+                self.assertIn((0, 0), sliceobj)
+                self.assertNotIn((0, 1), sliceobj)
 
-class TestPermutations(unittest.TestCase):
-    ################
-    # Construction #
-    ################
+def partitions_reference(seq, r):
+    """Return the list of partitions of `seq` into `r` blocks, by filtering all candidate restricted growth strings."""
+    result = []
+    for rgs in itertools.product(range(r), repeat=len(seq)):
+        if len(set(rgs)) == r and all(rgs[p] <= max(rgs[:p], default=-1) + 1 for p in range(len(seq))):
+            blocks = [[] for _ in range(r)]
+            for x, b in zip(seq, rgs):
+                blocks[b].append(x)
+            result.append(tuple(map(tuple, blocks)))
+    return result
+
+class CombinatoricTests:
+    """
+    Checks shared by the tests of each random-access combinatoric sequence, mixed into a TestCase.
+    
+    Subclasses set `combinatoric` to the class under test, `reference` to a function returning the list of its items
+    for the same arguments, `params` to the `(seq, r)` arguments to check against the reference,
+    `slice_params` to the arguments of an instance for exhaustive slicing, and `run_params` to the arguments
+    of a large instance to take slices of each length in `run_lengths` from.
+    """
+    
+    def search_items(self, seq, r, reference):
+        """Return the items to search each instance for: every tuple of `r` elements of `seq`, or a missing element."""
+        return itertools.product(tuple(seq) + ('Z',), repeat=r)
     
     ##########
     # Length #
     ##########
     
+    def test_len(self):
+        for seq, r in self.params:
+            with self.subTest(seq=seq, r=r):
+                self.assertEqual(len(self.combinatoric(seq, r)), len(self.reference(seq, r)))
+    
     ###############
     # Item access #
     ###############
     
+    def test_getitem(self):
+        """Check that every item, and every slice, matches the reference."""
+        for seq, r in self.params:
+            instance  = self.combinatoric(seq, r)
+            reference = self.reference(seq, r)
+            with self.subTest(seq=seq, r=r):
+                for i in range(-len(reference), len(reference)):
+                    self.assertEqual(instance[i], reference[i])
+                for bad_i in (-len(reference) - 1, len(reference)):
+                    with self.assertRaises(IndexError):
+                        instance[bad_i]
+                for index in (slice(None), slice(1, -1, 2), slice(None, None, -3)):
+                    self.assertEqual(list(instance[index]), reference[index])
+    
     #############
     # Iteration #
     #############
     
+    def test_iteration(self):
+        for seq, r in self.params:
+            with self.subTest(seq=seq, r=r):
+                reference = self.reference(seq, r)
+                self.assertEqual(list(self.combinatoric(seq, r)), reference)
+                self.assertEqual(list(reversed(self.combinatoric(seq, r))), reference[::-1])
+                self.assertEqual(list(Reversed(self.combinatoric(seq, r))), reference[::-1])
+    
+    def test_slice_iteration(self):
+        """
+        Check that slices step through items in both directions, including by steps too large to step through.
+        """
+        instance  = self.combinatoric(*self.slice_params)
+        reference = self.reference(*self.slice_params)
+        for args in itertools.product((None, 3, -10), (None, 50, -2), (None, 1, 2, 7, -1, -3, 40, -40)):
+            index = slice(*args)
+            with self.subTest(index=index):
+                self.assertEqual(list(instance[index]), reference[index])
+        self.assertIsInstance(instance[1:], self.combinatoric.Slice)
+    
+    def test_slice_iteration_runs(self):
+        """
+        Check that long slices of a large instance step through the same items as unranking each index,
+        whether they are shorter or longer than the input (for `run_lengths`), in both directions.
+        """
+        instance = self.combinatoric(*self.run_params)
+        start = instance.len() // 2
+        for step, length in itertools.product((1, 3, -1, -3), self.run_lengths):
+            with self.subTest(step=step, length=length):
+                indices = range(start, start + length * step, step)
+                self.assertEqual(list(instance[indices.start:indices.stop:step]), [instance[i] for i in indices])
+    
     ##########
     # Search #
     ##########
-    pass
+    
+    def test_search(self):
+        """Check that `in`, `index`, and `count` agree with searching a list, including with repeated elements."""
+        for seq, r in self.params:
+            instance  = self.combinatoric(seq, r)
+            reference = self.reference(seq, r)
+            for item in self.search_items(seq, r, reference):
+                with self.subTest(seq=seq, r=r, item=item):
+                    self.assertEqual(item in instance, item in reference)
+                    self.assertEqual(instance.count(item), reference.count(item))
+                    if item in reference:
+                        self.assertEqual(instance.index(item), reference.index(item))
+                    else:
+                        with self.assertRaises(ValueError):
+                            instance.index(item)
+        with self.assertRaises(TypeError):
+            'A' in self.combinatoric("ABC", 1)
+        self.assertEqual(self.combinatoric("ABC", 1).count('A'), 0)
+
+class TestPermutations(CombinatoricTests, unittest.TestCase):
+    combinatoric = Permutations
+    reference    = staticmethod(lambda seq, r: list(itertools.permutations(seq, r)))
+    params       = (((), None), ("A", None), ("ABCD", None), ("ABCD", 2), ("AABAB", 3), ((0, 1, 0), 0), ("ABC", 4),
+                    (([1], [1], [2]), 2))
+    slice_params = ("ABCDEF", 3)
+    run_params   = (range(200), 4)
+    run_lengths  = (100, 5000)
+    
+    def search_items(self, seq, r, reference):
+        return super().search_items(seq, len(seq) if r is None else r, reference)
+    
+    ################
+    # Construction #
+    ################
+    
+    def test_construction(self):
+        self.assertEqual(Permutations("ABC"), Permutations(('A', 'B', 'C'), 3))
+        self.assertNotEqual(Permutations("ABC"), Permutations("ABC", 2))
+        with self.assertRaises(ValueError):
+            Permutations("ABC", -1)
+    
+    ##########
+    # Length #
+    ##########
+    
+    def test_len_huge(self):
+        self.assertEqual(Permutations(range(100), 50).len(), math.factorial(100) // math.factorial(50))
+    
+    ###############
+    # Item access #
+    ###############
+    
+    def test_huge(self):
+        """Check that ranking inverts unranking far beyond the reach of iteration."""
+        instance = Permutations(range(200), 150)
+        for i in (0, 1, 10**250, instance.len() // 3, instance.len() - 1):
+            with self.subTest(i=i):
+                item = instance[i]
+                self.assertEqual(len(set(item)), 150)
+                self.assertEqual(instance.index(item), i)
+        self.assertEqual(instance[-1], tuple(range(199, 49, -1)))
+
+class TestCombinations(CombinatoricTests, unittest.TestCase):
+    combinatoric = Combinations
+    reference    = staticmethod(lambda seq, r: list(itertools.combinations(seq, r)))
+    params       = (((), 0), ("A", 1), ("ABCDE", 3), ("ABCD", 0), ("AABAB", 3), ((0, 1, 0), 2), ("ABC", 4),
+                    (([1], [1], [2]), 2))
+    slice_params = ("ABCDEF", 3)
+    run_params   = (range(200), 4)
+    run_lengths  = (100, 5000)
+    
+    ################
+    # Construction #
+    ################
+    
+    def test_construction(self):
+        self.assertEqual(Combinations("ABC", 2), Combinations(('A', 'B', 'C'), 2))
+        self.assertNotEqual(Combinations("ABC", 2), Permutations("ABC", 2))
+        with self.assertRaises(ValueError):
+            Combinations("ABC", -1)
+    
+    ##########
+    # Length #
+    ##########
+    
+    def test_len_huge(self):
+        self.assertEqual(Combinations(range(1000), 500).len(), math.comb(1000, 500))
+    
+    ###############
+    # Item access #
+    ###############
+    
+    def test_huge(self):
+        """Check that ranking inverts unranking far beyond the reach of iteration."""
+        instance = Combinations(range(300), 150)
+        for i in (0, 1, 10**80, instance.len() // 3, instance.len() - 1):
+            with self.subTest(i=i):
+                item = instance[i]
+                self.assertEqual(list(item), sorted(set(item)))
+                self.assertEqual(instance.index(item), i)
+        self.assertEqual(instance[-1], tuple(range(150, 300)))
+
+class TestCombinationsWithReplacement(CombinatoricTests, unittest.TestCase):
+    combinatoric = CombinationsWithReplacement
+    reference    = staticmethod(lambda seq, r: list(itertools.combinations_with_replacement(seq, r)))
+    params       = (((), 0), ((), 2), ("A", 3), ("ABCD", 3), ("ABCD", 0), ("AABAB", 3), ((0, 1, 0), 2),
+                    (([1], [1], [2]), 2))
+    slice_params = ("ABCDE", 4)
+    run_params   = (range(10**6), 5)
+    run_lengths  = (1000,)
+    
+    ################
+    # Construction #
+    ################
+    
+    def test_construction(self):
+        self.assertEqual(CombinationsWithReplacement("ABC", 2), CombinationsWithReplacement(('A', 'B', 'C'), 2))
+        self.assertNotEqual(CombinationsWithReplacement("ABC", 2), Combinations("ABC", 2))
+        with self.assertRaises(ValueError):
+            CombinationsWithReplacement("ABC", -1)
+    
+    ##########
+    # Length #
+    ##########
+    
+    def test_len_huge(self):
+        self.assertEqual(CombinationsWithReplacement(range(10**6), 20).len(), math.comb(10**6 + 19, 20))
+    
+    ###############
+    # Item access #
+    ###############
+    
+    def test_huge(self):
+        """Check that ranking inverts unranking far beyond the reach of iteration."""
+        instance = CombinationsWithReplacement(range(1000), 100)
+        for i in (0, 1, 10**80, instance.len() // 3, instance.len() - 1):
+            with self.subTest(i=i):
+                item = instance[i]
+                self.assertEqual(list(item), sorted(item))
+                self.assertEqual(instance.index(item), i)
+        self.assertEqual(instance[-1], (999,) * 100)
+
+class TestPartitions(CombinatoricTests, unittest.TestCase):
+    combinatoric = Partitions
+    reference    = staticmethod(partitions_reference)
+    params       = (((), 0), ((), 1), ("A", 0), ("A", 1), ("ABCD", 2), ("ABCDE", 3), ("ABCDE", 5), ("AABA", 2), ("ABC", 4),
+                    (([1], [1], [2], [1]), 2))
+    slice_params = ("ABCDEF", 3)
+    run_params   = (range(50), 7)
+    run_lengths  = (300,)
+    
+    def search_items(self, seq, r, reference):
+        """Return every partition, and some tuples that are not partitions of `seq` into `r` blocks."""
+        return reference + [(), (('Z',),), (tuple(seq),), ((),) * r, tuple(tuple(seq[k:k + 1]) for k in range(r))]
+    
+    ################
+    # Construction #
+    ################
+    
+    def test_construction(self):
+        self.assertEqual(Partitions("ABC", 2), Partitions(('A', 'B', 'C'), 2))
+        with self.assertRaises(ValueError):
+            Partitions("ABC", -1)
+    
+    ##########
+    # Length #
+    ##########
+    
+    def test_len_huge(self):
+        # The Stirling numbers S(n, 2) = 2**(n-1) - 1 and S(n, n-1) = n choose 2.
+        self.assertEqual(Partitions(range(300), 2).len(), 2**299 - 1)
+        self.assertEqual(Partitions(range(300), 299).len(), math.comb(300, 2))
+    
+    ###############
+    # Item access #
+    ###############
+    
+    def test_huge(self):
+        """Check that ranking inverts unranking far beyond the reach of iteration."""
+        instance = Partitions(range(200), 20)
+        for i in (0, 1, 10**200, instance.len() // 3, instance.len() - 1):
+            with self.subTest(i=i):
+                item = instance[i]
+                self.assertEqual(len(item), 20)
+                self.assertEqual(sorted(itertools.chain.from_iterable(item)), list(range(200)))
+                self.assertEqual(instance.index(item), i)
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,308 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+##################################################################################
+# seqtools Copyright (C) 2018 Simon Wyatt <simon.d.wyatt@gmail.com>              #
+# This program is free software: you can redistribute it and/or modify it under  #
+# the terms of the GNU General Public License as published by the Free Software  #
+# Foundation, either version 3 of the License, or (at your option) any later     #
+# version.                                                                       #
+#                                                                                #
+# This program is distributed in the hope that it will be useful, but WITHOUT    #
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS  #
+# FOR A PARTICULAR PURPOSE. See the GNU General Public License for more details. #
+#                                                                                #
+# You should have received a copy of the GNU General Public License along with   #
+# this program. If not, see <http://www.gnu.org/licenses/>.                      #
+##################################################################################
+
+"""
+This module provides a sequence type reading fixed-width binary records from a memory-mapped file.
+
+Classes:
+    MappedRecords: Sequence of the records in a file, decoded on access.
+"""
+
+import os, mmap, struct, bisect, operator
+
+from reversed import _normalize_indices
+from seqslice import SeqSlice, SeqSliceable, _CHUNK_SIZE
+
+try: # NumPy is optional: it is only needed for records described by a NumPy dtype.
+    import numpy
+except ImportError:
+    numpy = None
+
+class MappedRecords(SeqSliceable):
+    """
+    Precondition : `path` names a file consisting of a header of `offset` bytes followed by a whole number of records,
+    each packed according to `fmt`: either a `struct` format string, or (if NumPy is available) a NumPy dtype.
+    Postcondition: `MappedRecords(path, fmt, offset)` is the sequence of records in the file, each decoded on access
+    as a tuple of its fields, or as a single value if `fmt` has only one field.
+    If `is_sorted` is true, the records must be in ascending order, and the search methods (`in`, `index`, `count`)
+    bisect the records instead of scanning them.
+    
+    The file is mapped read-only into memory, so opening it costs the same whatever its size,
+    and processes mapping the same file share a single copy of it in the page cache.
+    Pickling a MappedRecords (e.g. to send it to a `multiprocessing` worker) pickles only its arguments,
+    and unpickling maps the file again. The mapping is released by `close()`, or on leaving a `with` block.
+    
+    Slicing produces lazy `MappedRecords.Slice` views, so a MappedRecords can serve as the base of a `SeqSlice`,
+    as a factor of a `Product`, or be reversed with `Reversed`, without reading the file into memory.
+    Searching a `Product` (or combinatoric sequence) of sorted records also bisects them, without building a table.
+    The file must not change while it is mapped.
+    
+    Examples:
+        >>> import tempfile
+        >>> with tempfile.NamedTemporaryFile(delete=False) as f:
+        ...     _ = f.write(struct.pack('<6i', 2, 3, 5, 7, 11, 13))
+        >>> primes = MappedRecords(f.name, '<i', is_sorted=True)
+        >>> len(primes), primes[1], primes[-1]
+        (6, 3, 13)
+        >>> list(primes[::2])
+        [2, 5, 11]
+        >>> primes.index(7), 8 in primes
+        (3, False)
+        >>> primes.close()
+        >>> os.remove(f.name)
+    """
+    
+    # Abstraction function: the file at `_path`, less its first `_offset` bytes, holds records r[0], ..., r[_len - 1],
+    #   where r[i] is packed in the `_size` bytes starting at byte `_offset + i * _size`.
+    # Representation invariant: Exactly one of `_struct` and `_dtype` is None. `_mmap` maps the whole file,
+    #   or is None if the file is empty. `_array` is a NumPy array of the records if `_dtype` is set and `_len > 0`,
+    #   and None otherwise. `_single` is whether a record has only one field, so is decoded as a single value
+    #   (for a dtype, whether it is not structured, as NumPy then decodes records as scalars rather than tuples).
+    
+    __slots__ = ('_path', '_format', '_offset', '_sorted', '_struct', '_dtype', '_size', '_single', '_len', '_mmap', '_array')
+    
+    _seqtools_frozen = True # The length is fixed when the file is mapped; see `SeqSlice`.
+    
+    @property
+    def _seqtools_searchable(self):
+        """Sorted records are searched by bisection, so `Product` and the combinatoric sequences need no table of them."""
+        return self._sorted
+    
+    ################
+    # Construction #
+    ################
+    
+    def __init__(self, path, fmt, offset=0, is_sorted=False):
+        """
+        Initialize a new MappedRecords instance by mapping the file at `path`.
+        
+        Raise ValueError if the file (after the header) is not a whole number of records.
+        """
+        self._path, self._format, self._offset, self._sorted = path, fmt, offset, is_sorted
+        if isinstance(fmt, str):
+            self._struct, self._dtype = struct.Struct(fmt), None
+            self._size = self._struct.size
+            self._single = len(self._struct.unpack(bytes(self._size))) == 1
+        elif numpy is None:
+            raise ImportError("MappedRecords requires NumPy for records described by a dtype")
+        else:
+            self._struct, self._dtype = None, numpy.dtype(fmt)
+            self._size = self._dtype.itemsize
+            self._single = self._dtype.names is None
+        if self._size == 0:
+            raise ValueError("MappedRecords requires records of positive size")
+        
+        with open(path, 'rb') as f:
+            filesize = os.fstat(f.fileno()).st_size
+            if not 0 <= offset <= filesize or (filesize - offset) % self._size:
+                raise ValueError("{!r} does not hold a whole number of {}-byte records after a header of {} bytes"
+                                 .format(path, self._size, offset))
+            self._len = (filesize - offset) // self._size
+            # An empty file cannot be mapped, but then it holds no records either.
+            # The mapping stays valid after the file is closed.
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if filesize else None
+        
+        self._array = None
+        if self._dtype is not None and self._len:
+            self._array = numpy.frombuffer(self._mmap, self._dtype, count=self._len, offset=offset)
+    
+    def close(self):
+        """
+        Release the memory mapping. Reading records from `self` or its views afterwards raises ValueError.
+        """
+        self._array = None # Release the array's hold on the mapping first, or closing it fails.
+        if self._mmap is not None:
+            self._mmap.close()
+    
+    def _check_open(self):
+        """Raise ValueError if `self` has been closed."""
+        if self._mmap is not None and self._mmap.closed:
+            raise ValueError("I/O operation on closed MappedRecords")
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.close()
+    
+    def __reduce__(self):
+        return (type(self), (self._path, self._format, self._offset, self._sorted))
+    
+    def __repr__(self):
+        return "{}({!r}, {!r})".format(type(self).__name__, self._path, self._format)
+    
+    ##########
+    # Length #
+    ##########
+    
+    def len(self):
+        return self._len
+    
+    def __len__(self):
+        return self._len
+    
+    ###############
+    # Item access #
+    ###############
+    
+    def __getitem__(self, index):
+        """
+        Return `self[index]`. Slices are lazy `MappedRecords.Slice` views of `self`.
+        """
+        if isinstance(index, slice):
+            return type(self).Slice(self, index)
+        if not -self._len <= index < self._len:
+            raise IndexError("MappedRecords index out of range")
+        if index < 0:
+            index += self._len
+        self._check_open()
+        if self._struct is None:
+            return self._array[index].item() # A Python scalar, or a tuple for a structured dtype.
+        record = self._struct.unpack_from(self._mmap, self._offset + index * self._size)
+        return record[0] if self._single else record
+    
+    def take(self, indices):
+        """
+        Return the records at each of the positions in `indices`, as a list.
+        
+        Equivalent to `[self[i] for i in indices]`, but the indices are bounds-checked at once,
+        and with a NumPy dtype the records are gathered and decoded in bulk.
+        Raises IndexError if any index is out of range.
+        """
+        positions = _normalize_indices(indices, self._len, type(self).__name__)
+        self._check_open()
+        if self._struct is None:
+            if self._array is None: # An empty file.
+                return []
+            return self._array.take(positions).tolist()
+        unpack, mapped, offset, size = self._struct.unpack_from, self._mmap, self._offset, self._size
+        records = [unpack(mapped, offset + i * size) for i in positions]
+        return [record[0] for record in records] if self._single else records
+    
+    #############
+    # Iteration #
+    #############
+    
+    def __iter__(self):
+        return self._iter(0, self._len)
+    
+    def _iter(self, start, stop):
+        """
+        Iterate over `self[start:stop]`, decoding the records in bulk, a chunk at a time.
+        
+        Precondition: `0 <= start` and `stop <= self.len()`.
+        Raises ValueError on reaching a chunk after `self` has been closed.
+        """
+        for lo in range(start, stop, _CHUNK_SIZE):
+            hi = min(lo + _CHUNK_SIZE, stop)
+            self._check_open()
+            if self._struct is None:
+                records = self._array[lo:hi].tolist()
+            else:
+                with memoryview(self._mmap)[self._offset + lo * self._size : self._offset + hi * self._size] as view:
+                    records = list(self._struct.iter_unpack(view))
+                if self._single:
+                    records = [record[0] for record in records]
+            yield from records
+        # Each chunk is decoded before it is yielded, and its view released, so no export of the mapping is held
+        # between chunks, and `close()` succeeds even while an iterator is suspended.
+    
+    #############
+    # Searching #
+    #############
+    
+    def __contains__(self, x):
+        if not self._sorted:
+            return super().__contains__(x)
+        lo, hi = _equal_range(self, x, 0, self._len)
+        return lo < hi
+    
+    def index(self, x, start=0, stop=None):
+        """
+        Return the first index of `x` in `self[start:stop]`. Raise ValueError if `x` is not present.
+        """
+        if not self._sorted:
+            return super().index(x, start, stop)
+        lo, hi, _ = slice(start, stop).indices(self._len)
+        i, j = _equal_range(self, x, lo, max(lo, hi))
+        if i < j:
+            return i
+        raise ValueError("MappedRecords.index(x): x not in sequence")
+    
+    def count(self, x):
+        if not self._sorted:
+            return super().count(x)
+        lo, hi = _equal_range(self, x, 0, self._len)
+        return hi - lo
+    
+    ##########
+    # Slices #
+    ##########
+    
+    class Slice(SeqSlice):
+        __slots__ = ()
+        
+        def __iter__(self):
+            start, _, step = self._bounds()
+            if step == 1:
+                return self._seq._iter(start, start + self.len())
+            return super().__iter__()
+        
+        def _is_sorted(self):
+            return self._seq._sorted and self._bounds()[2] > 0
+        
+        @property
+        def _seqtools_searchable(self):
+            return self._is_sorted()
+        
+        def __contains__(self, x):
+            if not self._is_sorted():
+                return super().__contains__(x)
+            lo, hi = _equal_range(self, x, 0, self.len())
+            return lo < hi
+        
+        def index(self, x, start=0, stop=None):
+            if not self._is_sorted():
+                return super().index(x, start, stop)
+            lo, hi, _ = slice(start, stop).indices(self.len())
+            i, j = _equal_range(self, x, lo, max(lo, hi))
+            if i < j:
+                return i
+            raise ValueError("MappedRecords.Slice.index(x): x not in sequence")
+        
+        def count(self, x):
+            if not self._is_sorted():
+                return super().count(x)
+            lo, hi = _equal_range(self, x, 0, self.len())
+            return hi - lo
+
+def _equal_range(seq, x, lo, hi):
+    """
+    Return the bounds `(i, j)` of the run of items equal to `x` in `seq[lo:hi]`, as indices into `seq`.
+    
+    Precondition: `seq[lo:hi]` is sorted in ascending order.
+    An item not comparable with the items of `seq` has an empty run, as it is equal to none of them.
+    """
+    try:
+        return bisect.bisect_left(seq, x, lo, hi), bisect.bisect_right(seq, x, lo, hi)
+    except TypeError:
+        return lo, lo
+
+if __name__ == "__main__":
+    import doctest
+    doctest.testmod()
@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+##################################################################################
+# seqtools Copyright (C) 2018 Simon Wyatt <simon.d.wyatt@gmail.com>              #
+# This program is free software: you can redistribute it and/or modify it under  #
+# the terms of the GNU General Public License as published by the Free Software  #
+# Foundation, either version 3 of the License, or (at your option) any later     #
+# version.                                                                       #
+#                                                                                #
+# This program is distributed in the hope that it will be useful, but WITHOUT    #
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS  #
+# FOR A PARTICULAR PURPOSE. See the GNU General Public License for more details. #
+#                                                                                #
+# You should have received a copy of the GNU General Public License along with   #
+# this program. If not, see <http://www.gnu.org/licenses/>.                      #
+##################################################################################
+
+"""Unit tests for the `mappedrecords` module and its `MappedRecords` class."""
+
+import unittest, itertools, os, pickle, struct, tempfile
+import mappedrecords
+from mappedrecords import MappedRecords
+from combinatorics import Product, Combinations
+from reversed import Reversed
+from seqslice import SeqSlice
+
+class TestMappedRecords(unittest.TestCase):
+    def setUp(self):
+        self.values = [3 * i // 2 for i in range(1000)] # Sorted, with some repeated values.
+        self.pairs = [(i, -i) for i in range(10)]
+        self.path = self.write(b'HEADER' + struct.pack('<1000i', *self.values))
+    
+    def tearDown(self):
+        for path in self.paths:
+            os.remove(path)
+    
+    def write(self, data):
+        with tempfile.NamedTemporaryFile(delete=False) as f:
+            f.write(data)
+        self.paths = getattr(self, 'paths', []) + [f.name]
+        return f.name
+    
+    ################
+    # Construction #
+    ################
+    
+    def test_bad_size(self):
+        """
+        Check that a file not holding a whole number of records after its header is rejected,
+        and that an empty file holds no records.
+        """
+        # Coverage: __init__ (all branches)
+        for offset in (0, 5, 4007):
+            with self.subTest(offset=offset):
+                with self.assertRaises(ValueError):
+                    MappedRecords(self.path, '<i', offset)
+        with MappedRecords(self.write(b''), '<i') as empty:
+            self.assertEqual(len(empty), 0)
+            self.assertEqual(list(empty), [])
+            self.assertNotIn(0, empty)
+    
+    def test_pickle(self):
+        """
+        Check that pickling maps the same file again, as when sending a MappedRecords to another process.
+        """
+        # Coverage: __reduce__
+        with MappedRecords(self.path, '<i', 6, is_sorted=True) as records:
+            with pickle.loads(pickle.dumps(records)) as copy:
+                self.assertIsNot(copy._mmap, records._mmap)
+                self.assertEqual(list(copy), self.values)
+                self.assertTrue(copy._sorted)
+    
+    ###############
+    # Item access #
+    ###############
+    
+    def test_items(self):
+        """
+        Check that single-field records are decoded as values, and records with several fields as tuples.
+        """
+        # Coverage: __getitem__ (single item branch), __iter__, _iter, len
+        with MappedRecords(self.path, '<i', 6) as records:
+            self.assertEqual(len(records), len(self.values))
+            self.assertEqual(list(records), self.values)
+            for i in (0, 1, 999, -1, -1000):
+                self.assertEqual(records[i], self.values[i])
+            for i in (1000, -1001):
+                with self.assertRaises(IndexError):
+                    records[i]
+        
+        path = self.write(struct.pack('<' + 'hq' * 10, *itertools.chain.from_iterable(self.pairs)))
+        with MappedRecords(path, '<hq') as records:
+            self.assertEqual(records[3], (3, -3))
+            self.assertEqual(list(records), self.pairs)
+    
+    def test_closed(self):
+        """
+        Check that a MappedRecords can be closed during iteration, and that reading it afterwards raises ValueError.
+        """
+        # Coverage: close, _check_open, _iter
+        records = MappedRecords(self.path, '<i', 6)
+        items, view = iter(records), iter(records[::3])
+        self.assertEqual(next(items), self.values[0])
+        records.close() # No buffer is held by the suspended iterator.
+        for read in (lambda: list(records), lambda: list(view), lambda: records[0], lambda: records.take([1])):
+            with self.assertRaises(ValueError):
+                read()
+    
+    def test_take(self):
+        """
+        Check that `take` agrees with subscripting one index at a time, also through views and products.
+        """
+        # Coverage: take
+        indices = [0, -1, 500, 3, 3, -1000]
+        with MappedRecords(self.path, '<i', 6) as records:
+            self.assertEqual(records.take(indices), [self.values[i] for i in indices])
+            self.assertEqual(records[::3].take([1, -1]), [self.values[3], self.values[999]])
+            self.assertEqual(Product(records, 'ab').take([1, -1]), [(self.values[0], 'b'), (self.values[-1], 'b')])
+            with self.assertRaises(IndexError):
+                records.take([1000])
+    
+    def test_slicing(self):
+        """
+        Check that slices are `MappedRecords.Slice` views producing the same items as explicit slices,
+        and that a MappedRecords works as the base of `SeqSlice`, `Reversed`, and `Product`.
+        """
+        # Coverage: __getitem__ (slice branch), Slice.__iter__
+        with MappedRecords(self.path, '<i', 6) as records:
+            for args in itertools.product((None, 5, -20), (None, 990, -3), (None, 1, 7, -1, -7)):
+                index = slice(*args)
+                with self.subTest(index=index):
+                    self.assertEqual(list(records[index]), self.values[index])
+                    self.assertEqual(list(SeqSlice(records, index)), self.values[index])
+            self.assertIsInstance(records[1:], MappedRecords.Slice)
+            self.assertEqual(list(Reversed(records[:10])), self.values[9::-1])
+            self.assertEqual(list(Product(records[:3], 'ab')), list(itertools.product(self.values[:3], 'ab')))
+            self.assertEqual(Product(records, repeat=2).index((6, 9)), 4 * 1000 + 6)
+    
+    #############
+    # Searching #
+    #############
+    
+    def test_search(self):
+        """
+        Check that `in`, `index`, and `count` agree with searching a list, whether or not the records are sorted.
+        """
+        # Coverage: __contains__, index, count, their Slice counterparts, _equal_range
+        for sorted_ in (True, False):
+            with MappedRecords(self.path, '<i', 6, is_sorted=sorted_) as records:
+                for seq, expected in ((records, self.values), (records[10:500:3], self.values[10:500:3]),
+                                      (records[::-2], self.values[::-2])):
+                    for x in (0, 1, 3, 15, 16, 1498, 2000, 'a'):
+                        with self.subTest(is_sorted=sorted_, seq=seq, x=x):
+                            self.assertEqual(x in seq, x in expected)
+                            self.assertEqual(seq.count(x), expected.count(x))
+                            for args in ((), (11,), (-50, -2)):
+                                try:
+                                    i = expected.index(x, *args)
+                                except ValueError:
+                                    with self.assertRaises(ValueError):
+                                        seq.index(x, *args)
+                                else:
+                                    self.assertEqual(seq.index(x, *args), i)
+    
+    def test_search_without_tables(self):
+        """
+        Check that `Product` and the combinatoric sequences search sorted records by bisection,
+        without enumerating them into lookup tables, and still agree with searching lists.
+        """
+        # Coverage: _seqtools_searchable, Slice._seqtools_searchable
+        with MappedRecords(self.path, '<i', 6, is_sorted=True) as records:
+            P = Product(records, 'ab')
+            self.assertEqual(P.index((16, 'b')), 2 * self.values.index(16) + 1)
+            self.assertEqual(P.count((16, 'a')), self.values.count(16))
+            self.assertNotIn((2, 'a'), P)
+            self.assertIs(P._tables[0], False)
+            
+            C = Combinations(records[:20], 2)
+            reference = list(itertools.combinations(self.values[:20], 2))
+            for item in ((0, 1), (3, 4), (4, 3), (1, 2)):
+                with self.subTest(item=item):
+                    self.assertEqual(C.count(item), reference.count(item))
+                    self.assertEqual(item in C, item in reference)
+            self.assertIsNone(C._positions)
+        
+        with MappedRecords(self.path, '<i', 6) as records:
+            self.assertFalse(records._seqtools_searchable)
+            self.assertFalse(records[::-1]._seqtools_searchable)
+    
+    #########
+    # NumPy #
+    #########
+    
+    @unittest.skipIf(mappedrecords.numpy is None, "requires NumPy")
+    def test_dtype(self):
+        """
+        Check that records described by a NumPy dtype decode to the same Python values as with a struct format.
+        """
+        # Coverage: __init__ (dtype branch), __getitem__ (array branch), _iter (array branch), close
+        numpy = mappedrecords.numpy
+        with MappedRecords(self.path, numpy.dtype('<i4'), 6, is_sorted=True) as records:
+            self.assertEqual(list(records), self.values)
+            self.assertEqual(records[-2], self.values[-2])
+            self.assertEqual(list(records[3:40]), self.values[3:40])
+            self.assertEqual(records.index(16), self.values.index(16))
+            self.assertEqual(records.take([7, -1]), [self.values[7], self.values[-1]])
+        for read in (lambda: records[0], lambda: list(records), lambda: records.take([0])):
+            with self.assertRaises(ValueError):
+                read()
+        
+        path = self.write(struct.pack('<' + 'hq' * 10, *itertools.chain.from_iterable(self.pairs)))
+        with MappedRecords(path, numpy.dtype([('a', '<i2'), ('b', '<i8')])) as records:
+            self.assertEqual(list(records), self.pairs)
+            self.assertFalse(records._single)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -18,6 +18,61 @@
 
 from collections.abc import Sequence
 from abc import abstractmethod
+from array import array
+
+try: # NumPy is optional: batch operations use it when available, and fall back on pure Python otherwise.
+    import numpy
+except ImportError:
+    numpy = None
+
+_INT64_MAX = 2**63 - 1 # Largest index that NumPy's int64 arithmetic can represent.
+_CHUNK_SIZE = 4096 # Items per native slice copy; bounds the memory used while scanning a sequence in chunks.
+# Sequence types without `rindex`, whose native slices have an `index` method, for searching backwards chunk by chunk.
+_REVERSE_CHUNKABLE = (list, tuple, array)
+
+def _normalize_indices(indices, L, name, vectorize=True):
+    """
+    Bounds-check a batch of indices into a sequence of length `L`, and convert them to nonnegative positions.
+    
+    Precondition : `indices` is an iterable of integers (or a NumPy integer array).
+    Postcondition: Returns the positions as a NumPy int64 array if NumPy is available, `vectorize` is true, `L` fits
+        in an int64, and `indices` converts to a one-dimensional integer array; and as a list of Python integers otherwise.
+        Raises IndexError, naming the sequence type `name`, if any index is out of range.
+    """
+    if numpy is not None and vectorize and L <= _INT64_MAX:
+        array = numpy.asarray(indices)
+        if array.ndim == 1 and array.dtype.kind in 'iu':
+            if array.size and (array.max() >= L or (array.dtype.kind == 'i' and array.min() < -L)):
+                raise IndexError("{} index out of range".format(name))
+            array = array.astype(numpy.int64) # A copy, so the caller's array is untouched.
+            array[array < 0] += L
+            return array
+        # Otherwise the indices are Python integers too large for int64, or not integers at all,
+        # so fall through to the pure Python loop, which handles (or rejects) them.
+    positions = []
+    for i in indices:
+        if not (-L <= i < L):
+            raise IndexError("{} index out of range".format(name))
+        positions.append(i + L if i < 0 else i)
+    return positions
+
+def _gather(seq, positions):
+    """
+    Get the items of `seq` at each of `positions`, a list or NumPy array of nonnegative in-bounds indices.
+    
+    Delegates to `seq.take` if `seq` has such a method (as do NumPy arrays, and the sequences of this package).
+    Always returns a list, converting the result of `seq.take` into one if it is not already a list
+    (so for a NumPy array, the list of the same NumPy scalars that subscripting the array gives).
+    """
+    try:
+        take = seq.take
+    except AttributeError:
+        if numpy is not None and isinstance(positions, numpy.ndarray):
+            positions = positions.tolist()
+        return list(map(seq.__getitem__, positions))
+        # `map` over the bound `__getitem__` keeps the per-element loop in C for built-in sequence types.
+    items = take(positions)
+    return items if isinstance(items, list) else list(items)
 
 class SeqReversible(Sequence):
     """
@@ -28,6 +83,8 @@ class SeqReversible(Sequence):
     in some way more efficient than making an explicit copy or iterating over indices
     in reverse order.
     """
+    __slots__ = ()
+    
     @abstractmethod
     def _seqtools_reversed(self):
         """
@@ -68,8 +125,13 @@ class Reversed(SeqReversible):
     
         >>> Reversed(Reversed('abcdefghij'))
         'abcdefghij'
+        
+        >>> Reversed('abcdefghij').take([0, -1, 3])
+        ['j', 'a', 'g']
     """
     
+    __slots__ = ('_seq',)
+    
     ##############################################################################
     # Construction. Instance creation can be delegated to SeqReversible classes. #
     ##############################################################################
@@ -142,6 +204,24 @@ class Reversed(SeqReversible):
         else:
             return self._seq[self._revindex(index)]
     
+    def take(self, indices):
+        """
+        Return the items of `self` at each of the positions in `indices`, as a list.
+        
+        Equivalent to `[self[i] for i in indices]`, but the whole batch of indices is bounds-checked and reversed at once
+        (with NumPy, when available), and the items are then gathered by the `take` method of the underlying sequence
+        if it has one, or in a single loop otherwise.
+        Raises IndexError if any index is out of range.
+        """
+        L = self.len()
+        positions = _normalize_indices(indices, L, type(self).__name__)
+        if isinstance(positions, list):
+            positions = [L - 1 - i for i in positions]
+        else:
+            positions = (L - 1) - positions
+        return _gather(self._seq, positions)
+        # Correctness argument: For a nonnegative position `i`, `_revindex(i) == -1 - i` is position `L - 1 - i`.
+    
     def _revindex(self, i):
         """
         Reverse an index.
@@ -245,9 +325,35 @@ class Reversed(SeqReversible):
             index = self._revindex(self._seq.rindex(item, rstart, rstop)) + self.len()
             
             return index
+        elif isinstance(self._seq, _REVERSE_CHUNKABLE): # Search backwards through reversed native slices of the underlying sequence
+            return self._chunked_index(item, start, stop)
         else: # Fall back on default Sequence implementation -- this gets & checks items one at a time
             # Correctness follows from correctness of __getitem__
-            super().index(item, start, stop)
+            return super().index(item, start, stop)
+    
+    def _chunked_index(self, item, start, stop):
+        """
+        Search for `item` in `self[start:stop]` by calling the native `index` method of reversed slices of `self._seq`,
+        each of at most `_CHUNK_SIZE` items, in turn.
+        
+        Precondition: `self._seq` is an instance of one of the `_REVERSE_CHUNKABLE` types.
+        """
+        L = self.len()
+        lo, hi, _ = slice(start, stop).indices(L)
+        for offset in range(lo, hi, _CHUNK_SIZE):
+            first, last = L - 1 - offset, L - min(offset + _CHUNK_SIZE, hi) # Positions in `self._seq`, `first >= last`.
+            chunk = self._seq[first:(last - 1 if last > 0 else None):-1]
+            try:
+                return offset + chunk.index(item)
+            except ValueError:
+                pass
+        raise ValueError("Reversed.index(x): x not in sequence")
+        # Correctness argument: Position `i` of `self` is position `L - 1 - i` of `self._seq`, so the positions
+        # `offset`, ..., `offset + n - 1` of `self` are the positions `first`, ..., `last` of `self._seq` in descending order,
+        # where n is the chunk size (at most `_CHUNK_SIZE`, and clipped at `hi`). A slice with step -1 selects exactly these,
+        # except that a stop of -1 would count from the end of `self._seq`, so a chunk reaching position 0 stops at None.
+        # The chunks are searched in order of increasing position in `self`, so the first match is the least index.
+    
         
     # Counting: Invariant under reversal.
     def count(self, item):
@@ -18,8 +18,11 @@
 
 """Unit tests for the `reversed` module and its `Reversed` class."""
 
-import unittest, string
-from reversed import Reversed
+import unittest, string, itertools
+from array import array
+from collections.abc import Sequence
+from unittest import mock
+from reversed import Reversed, numpy, _CHUNK_SIZE
 alpha = string.ascii_lowercase
 
 class TestReversed(unittest.TestCase):
@@ -53,6 +56,12 @@ class TestReversed(unittest.TestCase):
         # Coverage: Reversed.__new__ (second branch), Reversed._seqtools_reversed.
         self.assertIs(Reversed(self.r_alpha), alpha)
     
+    def test_slots(self):
+        """
+        Check that `Reversed` instances carry no instance dictionary.
+        """
+        self.assertFalse(hasattr(self.r_alpha, '__dict__'))
+    
     def test_revinst(self):
         """
         Check that calling `Reversed(seq)` when `seq` is a built-in explicit sequence (eg string)
@@ -177,6 +186,29 @@ class TestReversed(unittest.TestCase):
         with self.assertRaises(ValueError):
             self.r_alpha[step0]
     
+    def test_take(self):
+        """
+        Check that `Reversed.take` agrees with subscripting one index at a time,
+        with and without NumPy, and gathers through the `take` method of the underlying sequence if it has one.
+        """
+        # Coverage: Reversed.take, _normalize_indices, _gather
+        indices = [0, 25, -1, -26, 7, 7]
+        for numpy_ in (numpy, None):
+            with self.subTest(numpy=numpy_ is not None), mock.patch('reversed.numpy', numpy_):
+                self.assertEqual(self.r_alpha.take(indices), [self.r_alpha[i] for i in indices])
+                self.assertEqual(self.r_alpha.take([]), [])
+                for bad_indices in ([26], [0, -27]):
+                    with self.assertRaises(IndexError):
+                        self.r_alpha.take(bad_indices)
+        
+        class Taking(list):
+            def take(self, positions):
+                self.taken = list(positions)
+                return tuple(self[i] for i in self.taken) # Converted to a list by `Reversed.take`.
+        seq = Taking(alpha)
+        self.assertEqual(Reversed(seq).take([0, -1, 2]), ['z', 'a', 'x'])
+        self.assertEqual(seq.taken, [25, 0, 23])
+    
     #############
     # Iteration #
     #############
@@ -258,6 +290,36 @@ class TestReversed(unittest.TestCase):
                 with self.assertRaises(ValueError):
                     s_r.index('e', i, j )
     
+    def test_index_without_rindex(self):
+        """
+        Check that `Reversed.index` searches underlying sequences lacking `rindex` correctly:
+        lists, tuples, and arrays in reversed native chunks, and other sequences one item at a time.
+        """
+        # Coverage: Reversed.index (chunked and fallback branches), Reversed._chunked_index
+        class Plain(Sequence): # A sequence with neither `rindex` nor native slicing.
+            def __init__(self, items):
+                self._items = items
+            def __len__(self):
+                return len(self._items)
+            def __getitem__(self, i):
+                return self._items[i]
+        
+        N = 2 * _CHUNK_SIZE + 10
+        items = [i % 1000 for i in range(N)]
+        expected = items[::-1]
+        bounds = ((), (5,), (-N,), (0, N), (1, -1), (_CHUNK_SIZE - 3, _CHUNK_SIZE + 3), (N - 5, N + 10), (40, 20))
+        for base in (items, tuple(items), array('i', items), Plain(items)):
+            r = Reversed(base)
+            for x, args in itertools.product((0, 9, 999, -1), bounds):
+                with self.subTest(base=type(base), x=x, args=args):
+                    try:
+                        i = expected.index(x, *args)
+                    except ValueError:
+                        with self.assertRaises(ValueError):
+                            r.index(x, *args)
+                    else:
+                        self.assertEqual(r.index(x, *args), i)
+    
     def test_count(self):
         """
         Check that number of occurrences of each item is invariant under reversal:
@@ -16,12 +16,61 @@
 # this program. If not, see <http://www.gnu.org/licenses/>.                      #
 ##################################################################################
 
-from reversed import SeqReversible
+import itertools, mmap, weakref
+from array import array
+from collections.abc import Sequence
+from abc import abstractmethod
+
+from reversed import SeqReversible, Reversed, _normalize_indices, _gather, _INT64_MAX, _CHUNK_SIZE
+
+# Sequence types whose slicing is implemented natively, producing a compact copy (or, for ranges, a new range).
+# Iterating a SeqSlice over one of these copies bounded chunks of it in C, instead of fetching items one at a time.
+_NATIVE_SLICEABLE = (list, tuple, str, bytes, bytearray, range, array)
+# Sequence types with a native `index(x, start, stop)` method bounded without copying.
+_NATIVE_BOUNDED_INDEX = (list, tuple, str, bytes, bytearray)
+# Sequence types supporting the buffer protocol, which a SeqSlice views through a memoryview instead of copying.
+_BUFFER_TYPES = (bytes, bytearray, array, memoryview, mmap.mmap)
+_UNLISTABLE_TYPECODES = ('u', 'w') # Array typecodes whose memoryviews do not support `tolist`.
+
+# Immutable sequence types, whose slices are frozen by default.
+# Other classes opt in by setting a class attribute `_seqtools_frozen = True`.
+_FROZEN_TYPES = (tuple, str, bytes, range)
+
+_INTERNED = weakref.WeakValueDictionary() # Live views shared by `SeqSlice.interned`.
+
+def _slice_len(start, stop, step):
+    """
+    Return the number of items selected by a slice normalized to `(start, stop, step)` by `slice.indices`.
+    """
+    # Algorithm reproduced from CPython implementation of slicing for ranges.
+    # See get_len_of_range in Objects/rangeobject.c of CPython
+    if (step > 0 and start < stop) or (step < 0 and start > stop):
+        return (abs(stop - start) - 1) // abs(step) + 1
+    else:
+        return 0
 
 class EmptySubsliceException(Exception):
     pass
 
-class SeqSlice(SeqReversible):
+class SeqSliceable(Sequence):
+    """
+    Abstract Base Class for a Sequence that provides its own slices, overriding the default behavior
+    of the `SeqSlice` class: `SeqSlice(seq, slice_)` is simply `seq[slice_]` for instances `seq`.
+    
+    A Sequence class should only inherit from SeqSliceable if slicing it produces a lazy view
+    (typically an instance of its own SeqSlice subclass) or an equally cheap sequence of the same kind,
+    rather than an explicit copy of the selected items.
+    """
+    __slots__ = ()
+    
+    @abstractmethod
+    def __getitem__(self, index):
+        """
+        Return `self[index]`, where slices produce lazy views of `self`.
+        """
+        raise NotImplementedError
+
+class SeqSlice(SeqReversible, SeqSliceable):
     """
     Base class for smart slices of sequence types.
     
@@ -30,17 +79,41 @@ class SeqSlice(SeqReversible):
         1.  Direct construction of lazy slices of explicit sequences (i.e. strings, lists, tuples).
         2.  Base class for sequence-specific slice classes, which can leverage additional facts about
             particular sequence classes to derive efficient implementations of e.g. __contains__, __iter__.
-            In this situation a SeqSlice instance should always be obtained by slicing the pertinent object,
-            never by invoking the SeqSlice constructor directly.
+            In this situation a SeqSlice instance should always be obtained by slicing the pertinent object;
+            the SeqSlice constructor does this itself when given an instance of the `SeqSliceable` ABC.
     
     This class chiefly implements the `len`, `__len__`, and `__getitem__` methods, which rely on arithmetic
     independent of the type of the underlying class.
     
-    `__contains__`, `__iter__`, `__reversed__`, `index`, and `count` fall back on the inherited methods
-    from the Sequence ABC, which use `__len__` and `__getitem__` to traverse the underlying sequence
+    `__iter__` and `__reversed__` copy native slices of built-in sequences (lists, tuples, strings, bytes, ranges, arrays)
+    in chunks, and `__contains__`, `index`, and `count` search those native slices, or for a step of 1
+    search the base sequence directly between the translated bounds. Otherwise, these methods fall back
+    on the inherited methods from the Sequence ABC, which use `__len__` and `__getitem__` to traverse the underlying sequence
     one element at a time. Sequences that lazily construct elements as a function of indices, rather than
     explicitly storing arbitrarily elements, can likely implement these methods more efficiently.
     
+    Buffers:
+        A slice of a sequence supporting the buffer protocol (bytes, bytearrays, arrays, memoryviews, mmaps)
+        can be viewed as a memoryview sharing memory with the base sequence, strided for steps other than 1,
+        by `buffer()` (or, on Python 3.12 and later, `memoryview(s)`). Iteration and searching read such slices
+        through such views, so they never copy more than a chunk of items at a time out of the base sequence,
+        and release each view before moving on, so they hold no export of the base sequence between items.
+    
+    Frozen slices:
+        By default, a SeqSlice re-normalizes its slice against the current length of the base sequence
+        every time it is used, so it stays correct if the base sequence is mutated.
+        A frozen SeqSlice instead normalizes its slice once, caching its bounds and length,
+        so that item access is a single multiply-add into the base sequence.
+        Slices of immutable bases (tuples, strings, bytes, ranges, and classes setting `_seqtools_frozen = True`)
+        are frozen by default; pass `frozen=True` to freeze a slice of a mutable sequence,
+        and call `refresh()` after changing the length of the base sequence. Subslices inherit the mode.
+        A frozen slice of an immutable base stores only its normalized integer bounds, not the slice object.
+        Its `repr` therefore shows those normalized bounds, rather than the bounds it was constructed with.
+    
+    Memory:
+        SeqSlice and its subclasses use `__slots__`, so a view costs no per-instance dictionary.
+        Where many identical views are made of the same base, `SeqSlice.interned` shares one live instance between them.
+    
     Examples:
         >>> from string import ascii_lowercase
         >>> s = SeqSlice(ascii_lowercase, slice(2, None, 2))
@@ -82,24 +155,138 @@ class SeqSlice(SeqReversible):
         'wqke'
         >>> ascii_lowercase[::-3][::2], ascii_lowercase[::-3][1::2]
         ('ztnhb', 'wqke')
+        
+        >>> s3.take([0, 2, -1])
+        ['z', 't', 'b']
     """
     
+    # Abstraction function: `self` represents `self._seq[self._slice]`.
+    # Representation: `_sl` holds the slice object, except in a frozen slice of an immutable base sequence,
+    #   where it is None and the `_slice` property reconstructs an equivalent slice from the cached bounds.
+    #   If `_frozen`, then `_start`, `_stop`, `_step` are `self._slice.indices(self._baselen())`, `_len` is the length,
+    #   and `_off_pos`, `_off_neg` are the offsets computed by `_compute_offsets`; otherwise these slots are unset.
+    __slots__ = ('_seq', '_sl', '_frozen', '_start', '_stop', '_step', '_len', '_off_pos', '_off_neg', '__weakref__')
+    
     ################
     # Construction #
     ################
     
-    # Future: Consider overriding __new__ to just return the base sequence without allocating a new wrapper object
-    # when using a trivial slice: step in (None, 1) and start in (None, 0, -L) and (stop is None or stop >= L)
-    # Also could do something similar to Reversed like using a new ABC to write something like
-    # if cls is SeqSlice and isinstance(seq, SeqSliceable):
-    #   return seq[slice_]
-    # where the first part of the condition is to stop an infinite recursion when this __new__ is
-    # inherited by the subclasses. This would force classes with their own specialized SeqSlice subclasses
-    # to always produce that subclass, even when passed directly to the base class constructor.
-    
-    def __init__(self, seq, slice_):
+    def __new__(cls, seq, slice_, frozen=None):
+        """
+        Create a slice of a sequence.
+        
+        Precondition:  `seq` is a sequence and `slice_` is a slice object.
+        Postcondition: `SeqSlice(seq, slice_)` is a sequence with the same items as `seq[slice_]`.
+            This need not be a `SeqSlice` object; specifically,
+                1. If `seq` is a range object, `SeqSlice(seq, slice_)` is `seq[slice_]`.
+                2. If `seq` is an instance of the `SeqSliceable` ABC, `SeqSlice(seq, slice_)` is `seq[slice_]`.
+                   This includes SeqSlice objects, whose slices are composed into a single slice of their base,
+                   frozen or not as `frozen` specifies (inheriting the mode of `seq` if `frozen` is None).
+                   Other `SeqSliceable` sequences produce slices in their own mode, and `frozen` is ignored.
+                3. If `seq` is a `Reversed` object, `SeqSlice(seq, slice_)` is a slice of the sequence it reverses,
+                   by an equivalent slice computed by `Reversed._revslice`.
+                4. If `slice_` selects all of `seq` in order, `SeqSlice(seq, slice_)` is `seq` itself,
+                   unless `seq` is mutable and the slice is frozen.
+                5. Otherwise, `SeqSlice(seq, slice_)` is a `SeqSlice` object, a view of `seq` through `slice_`.
+            Cases 1-3 apply only to the SeqSlice class itself, not to its subclasses,
+            since those are themselves what `seq[slice_]` produces for their own base classes.
+            Together with `Reversed` delegating to `SeqSlice._seqtools_reversed`, cases 2 and 3 flatten any stack
+            of `SeqSlice` and `Reversed` views into a single view of the underlying sequence,
+            so item access costs the same however many views were stacked.
+        
+        All initialization happens here rather than in `__init__`, which Python would otherwise
+        call again on the base sequence when case 4 returns an instance of this class.
+        """
+        if cls is SeqSlice:
+            if isinstance(seq, SeqSlice) and frozen is not None and frozen != seq._frozen:
+                # Compose the slices as `seq[slice_]` would, but in the requested mode rather than that of `seq`.
+                try:
+                    return type(seq)(seq._seq, seq._compose_slice(slice_), frozen)
+                except EmptySubsliceException:
+                    return seq[slice_]
+            if isinstance(seq, (range, SeqSliceable)):
+                return seq[slice_]
+            elif isinstance(seq, Reversed):
+                return SeqSlice(seq._seq, seq._revslice(slice_), frozen)
+        
+        self = super(SeqSlice, cls).__new__(cls)
         self._seq = seq
-        self._slice = slice_
+        immutable = isinstance(seq, _FROZEN_TYPES) or getattr(seq, '_seqtools_frozen', False)
+        if frozen is None:
+            frozen = immutable
+        # Only a slice that may need refreshing against a changed base sequence needs to keep its slice object.
+        self._sl = None if frozen and immutable else slice_
+        self._frozen = frozen
+        if frozen:
+            self._freeze(slice_)
+            # A frozen slice of a mutable base keeps its bounds when the base grows, so it is never the base itself.
+            if immutable and self._bounds() == (0, self._baselen(), 1):
+                return seq
+        elif slice_.start in (None, 0) and slice_.stop is None and slice_.step in (None, 1):
+            # A mutable base may change length, so only an omitted stop is guaranteed to reach its end.
+            return seq
+        return self
+    
+    def refresh(self):
+        """
+        Recompute the cached bounds of a frozen slice from the current length of the base sequence.
+        
+        Only needed for a slice constructed with `frozen=True` over a mutable sequence,
+        after that sequence has changed length; see the class docstring.
+        """
+        self._freeze(self._slice)
+    
+    def _freeze(self, slice_):
+        """Cache the bounds, length, and offsets of `slice_` against the current length of the base sequence."""
+        start, stop, step = slice_.indices(self._baselen())
+        self._start, self._stop, self._step = start, stop, step
+        self._len = _slice_len(start, stop, step)
+        self._off_pos, self._off_neg = self._compute_offsets(slice_, start, stop, step)
+        self._frozen = True
+    
+    @property
+    def _slice(self):
+        """
+        The slice of the base sequence viewed by `self`.
+        
+        For a frozen slice of an immutable base, this is reconstructed from the cached bounds,
+        giving None for a start or stop at the natural end of the base sequence in the direction of the step,
+        and for a step of 1.
+        """
+        if self._sl is not None:
+            return self._sl
+        start, stop, step = self._start, self._stop, self._step
+        L = self._baselen()
+        if step > 0:
+            start, stop = (None if start == 0 else start), (None if stop >= L else stop)
+        else:
+            start, stop = (None if start == L - 1 else start), (None if stop < 0 else stop)
+        return slice(start, stop, None if step == 1 else step)
+        # Correctness argument: `slice.indices` clips the bounds to the base sequence, so a positive step stops at `L`
+        # exactly when the slice runs off the back, and a negative step stops at -1 exactly when it runs off the front.
+    
+    @classmethod
+    def interned(cls, seq, slice_, frozen=None):
+        """
+        Return `cls(seq, slice_, frozen)`, reusing a live view of the same base sequence through the same slice if there is one.
+        
+        Views are shared only while some reference to them remains, so this saves memory only where many
+        identical views coexist; they must then be treated as immutable (in particular, not refreshed separately).
+        """
+        key = (id(seq), cls, slice_.start, slice_.stop, slice_.step, frozen)
+        view = _INTERNED.get(key)
+        if view is not None and view._seq is seq:
+            return view
+        view = cls(seq, slice_, frozen)
+        if isinstance(view, SeqSlice) and view._seq is seq:
+            _INTERNED[key] = view
+        return view
+        # Correctness argument: A cached view holds a reference to `seq`, so `seq` stays alive as long as the view does,
+        # and no other object can take over its `id` in the meantime. Views of other objects (produced by dispatch
+        # in `__new__`) are not cached, since they do not keep `seq` alive.
+    
+    def __reduce__(self):
+        return (type(self), (self._seq, self._slice, self._frozen))
     
     def _seqtools_reversed(self):
         return self[::-1]
@@ -120,22 +307,17 @@ class SeqSlice(SeqReversible):
         return L
     
     def _bounds(self):
+        if self._frozen:
+            return self._start, self._stop, self._step
         return self._slice.indices(self._baselen())
     
     def len(self):
-        # TODO: Verify. Possibly amenable to simplification.
-        
-        start, stop, step = self._bounds()
-        # This normalizes start and stop to positive indices,
+        if self._frozen:
+            return self._len
+        return _slice_len(*self._bounds())
+        # `_bounds` normalizes start and stop to positive indices,
         # eliminating the need to reason by cases on their signs or on whether they are None.
         
-        # Algorithm reproduced from CPython implementation of slicing for ranges.
-        # See get_len_of_range in Objects/rangeobject.c of CPython
-        if (step > 0 and start < stop) or (step < 0 and start > stop):
-            return (abs(stop - start) - 1) // abs(step) + 1
-        else:
-            return 0
-        
     def __len__(self):
         return self.len()
         
@@ -157,18 +339,49 @@ class SeqSlice(SeqReversible):
                 except TypeError: 
                     return () # Fall back on returning empty tuple, but may violate type assumptions.
             else:
-                return type(self)(self._seq, subslice)
+                return type(self)(self._seq, subslice, frozen=self._frozen)
+        elif self._frozen:
+            # Same as below, inlining the cached values.
+            if not (-self._len <= index < self._len):
+                raise IndexError("SeqSlice index out of range")
+            return self._seq[(self._off_neg if index < 0 else self._off_pos) + index * self._step]
         else:
-            # Check bounds before attempting index arithmetic; precondition of _compose_index requires this to happen here
-            L = self.len()
+            # Check bounds before attempting index arithmetic; precondition of _compose_index requires this to happen here.
+            # The base length and bounds are computed once here and passed on, rather than again by `_compose_index`.
+            slice_, baselen = self._sl, self._baselen()
+            bounds = slice_.indices(baselen)
+            L = _slice_len(*bounds)
             if not (-L <= index < L):
                 raise IndexError("SeqSlice index out of range")
             
-            return self._seq[self._compose_index(index)]
+            return self._seq[self._compose_index(index, bounds, baselen)]
+    
+    def take(self, indices):
+        """
+        Return the items of `self` at each of the positions in `indices`, as a list.
+        
+        Equivalent to `[self[i] for i in indices]`, but the whole batch of indices is bounds-checked and translated into
+        positions in the base sequence at once (with NumPy, when available), and the items are then gathered by
+        the `take` method of the base sequence if it has one, or in a single loop otherwise.
+        Raises IndexError if any index is out of range.
+        """
+        start, _, step = self._bounds()
+        positions = _normalize_indices(indices, self.len(), type(self).__name__,
+                                       vectorize=(self._baselen() <= _INT64_MAX))
+        if isinstance(positions, list):
+            positions = [start + i * step for i in positions]
+        else:
+            positions = positions * step + start
+        return _gather(self._seq, positions)
+        # Correctness argument: `start` is the nonnegative position of `self[0]` in the base sequence,
+        # and each subsequent item lies `step` positions further on, so every translated position is nonnegative
+        # and (as `self[i]` is in bounds) lies in the base sequence.
+        # Vectorizing only for a base sequence whose length fits in int64 keeps the arithmetic from overflowing.
     
-    def _compose_index(self, i):
+    def _compose_index(self, i, bounds=None, baselen=None):
         """
         Precondition:  `i` is an integer such that `-L <= i < L`, where `L = self.len()`.
+            If given, `bounds` and `baselen` are `self._bounds()` and `self._baselen()`, which are otherwise recomputed.
         Postcondition:
             `self._compose_index(i)` is one of the two integers `j` such that `self[i] = self._seq[j]`.
             The sign of `j` is determined as follows:
@@ -185,57 +398,80 @@ class SeqSlice(SeqReversible):
         but go past the stop of `self`.
         """
         
+        if self._frozen:
+            return (self._off_neg if i < 0 else self._off_pos) + i * self._step
+        if bounds is None:
+            bounds, baselen = self._bounds(), self._baselen()
+        start, stop, step = bounds
+        # Compute only the offset needed for the sign of `i`.
+        if i < 0:
+            return self._offset_neg(self._slice, start, stop, step, baselen) + i * step
+        return self._offset_pos(self._slice, start, step, baselen) + i * step
+    
+    def _compute_offsets(self, slice_, start, stop, step):
+        """
+        Precondition: `slice_` is `self._slice` and `(start, stop, step) == slice_.indices(self._baselen())`.
+        Postcondition: Returns a pair `(off_pos, off_neg)` such that `self._compose_index(i)` is `off_pos + i * step`
+            for nonnegative `i`, and `off_neg + i * step` for negative `i`.
+        """
+        baselen = self._baselen()
+        return self._offset_pos(slice_, start, step, baselen), self._offset_neg(slice_, start, stop, step, baselen)
+    
+    @staticmethod
+    def _offset_pos(slice_, start, step, baselen):
+        """Return the offset `off_pos` of `_compute_offsets`, given the base length `baselen`."""
         # We will calculate in the world of positive indices into the base sequence,
         # explicitly converting our answer to a negative number when necessary.
-        start, stop, step = self._bounds()
         
-        if i >= 0:
-            # Nonnegative indices are computed as offsets from the start position:
-            j = start + i * step
-            # Recall that the positive index for `start` has been taken regardless of the actual sign;
-            # so that we can explicitly control the sign of the return value:
-            # We give the negative solution when this slice is given with a negative start position,
-            # either explicitly, or by using start = None with a negative step size (implicit start = -1).
-            if ((self._slice.start is not None and self._slice.start < 0)
-            or  (self._slice.start is     None and step < 0)):
-                j -= self._baselen()
-        else:
-            # Negative indices are computed as offsets from a "base" position, roughly the "index after the last index".
-            
-            # With a positive step size (either explicitly or step = None), `base` is the smallest integer such that
-            #   stop <= base and base % step == start % step.
-            # From the extremal choice of `base` as the smallest such value, we obtain a second constraint
-            #   stop <= base < stop + step.
-            # Subtracting `stop` from each constraint,
-            #   0 <= base - stop < step
-            #   (base - stop) % step == (start - stop) % step
-            # The inequality tells us that (base - stop) % step == base - stop; substituting & rearranging,
-            base = (start - stop) % step + stop
-            
-            # With a negative step size, `base` is the largest integer such that
-            #   base <= stop and base % step == start % step.
-            # Proceeding much as in the preceding case,
-            #   stop + step < base        <= stop
-            #          step < base - stop <= 0,
-            # which tells us once again that (base - stop) % step == base - stop
-            # (recall that `x % step` produces the negative solution when step < 0)
-            # so the same formula remains correct.
-            
-            # Now take an offset from the computed base value.
-            j = base + i * step
-            # This will always be a positive index, since with i < 0, step < 0 this gives
-            #   j >= base - step
-            #   stop < base - step <= stop - step
-            # and we earlier took the positive for `stop`.
+        # Nonnegative indices are computed as offsets from the start position:
+        off_pos = start
+        # Recall that the positive index for `start` has been taken regardless of the actual sign;
+        # so that we can explicitly control the sign of the return value:
+        # We give the negative solution when this slice is given with a negative start position,
+        # either explicitly, or by using start = None with a negative step size (implicit start = -1).
+        if ((slice_.start is not None and slice_.start < 0)
+        or  (slice_.start is     None and step < 0)):
+            off_pos -= baselen
+        return off_pos
+    
+    @staticmethod
+    def _offset_neg(slice_, start, stop, step, baselen):
+        """Return the offset `off_neg` of `_compute_offsets`, given the base length `baselen`."""
+        # Negative indices are computed as offsets from a "base" position, roughly the "index after the last index".
+        
+        # With a positive step size (either explicitly or step = None), `base` is the smallest integer such that
+        #   stop <= base and base % step == start % step.
+        # From the extremal choice of `base` as the smallest such value, we obtain a second constraint
+        #   stop <= base < stop + step.
+        # Subtracting `stop` from each constraint,
+        #   0 <= base - stop < step
+        #   (base - stop) % step == (start - stop) % step
+        # The inequality tells us that (base - stop) % step == base - stop; substituting & rearranging,
+        off_neg = (start - stop) % step + stop
+        
+        # With a negative step size, `base` is the largest integer such that
+        #   base <= stop and base % step == start % step.
+        # Proceeding much as in the preceding case,
+        #   stop + step < base        <= stop
+        #          step < base - stop <= 0,
+        # which tells us once again that (base - stop) % step == base - stop
+        # (recall that `x % step` produces the negative solution when step < 0)
+        # so the same formula remains correct.
+        
+        # An offset `i * step` from the computed base value, with `i < 0`, will always be a positive index,
+        # since with i < 0, step < 0 this gives
+        #   j >= base - step
+        #   stop < base - step <= stop - step
+        # and we earlier took the positive for `stop`.
 
-            # Give the negative solution when this slice is given with a stop position
-            # relative to the end of the underlying sequence,
-            # either with an explicit negative stop parameter,
-            # or by using stop = None with a positive step size.
-            if ((self._slice.stop is not None and self._slice.stop < 0)
-            or  (self._slice.stop is     None and step > 0)):
-                j -= self._baselen()
-        return j
+        # Give the negative solution when this slice is given with a stop position
+        # relative to the end of the underlying sequence,
+        # either with an explicit negative stop parameter,
+        # or by using stop = None with a positive step size.
+        if ((slice_.stop is not None and slice_.stop < 0)
+        or  (slice_.stop is     None and step > 0)):
+            off_neg -= baselen
+        return off_neg
         
     def _compose_slice(self, s):
         """
@@ -248,6 +484,11 @@ class SeqSlice(SeqReversible):
         """
         # THIS IS HARDER TO GET RIGHT THAN YOU THINK.
         # Various combinations of negative indices and step sizes give rise to a lot of unintuitive corner cases.
+        
+        # Every subslice of an empty slice is empty. Catch this first: the clipping logic below would otherwise
+        # call `_compose_index` on out-of-bounds indices, violating its precondition.
+        if self.len() == 0:
+            raise EmptySubsliceException
                 
         # Default to start, stop, step parameters of `self`, then use `s` to modify.
         start, stop, step = self._slice.start, self._slice.stop, self._slice.step
@@ -331,14 +572,17 @@ class SeqSlice(SeqReversible):
         
         # Now follow up on the cases we flagged as needing to set the new `stop` based on the old `start`:
         if clipping_stop_to_old_start:
-            if self._slice.start is None or self._slice.start == 0:
-                # Special case: Force slice to go backwards off the front of the underlying sequence
-                # by setting `stop` to None.
+            if (self._slice.start is None
+            or (self._slice.start ==  0 and step < 0)
+            or (self._slice.start == -1 and step > 0)):
+                # Special cases: Force slice to go backwards off the front, or forwards off the back,
+                # of the underlying sequence by setting `stop` to None.
                 stop = None
-                # The general case would calculate -1 here, but that means the back of the sequence,
-                # which is completely opposite what we wanted.
+                # The general case would calculate -1 (resp. 0) here, but that means the back (resp. front)
+                # of the sequence, which is completely opposite what we wanted.
                 # Writing something like `-self._baselen() - 1` would be unsatisfactory
                 # because this is not guaranteed to still go off the front of `self._seq` if it is mutated.
+                # (An omitted start already lies at whichever end the new direction of travel runs off.)
             else:
                 # The old start still needs to be included, so stop one index past it,
                 # where "past" is relative to the step direction.
@@ -346,10 +590,148 @@ class SeqSlice(SeqReversible):
         
         return slice(start, stop, step)
     
-    #########################################
-    # Iteration, searching:                 #
-    # Inherit from collections.abc.Sequence #
-    #########################################
+    #############
+    # Iteration #
+    #############
+    
+    def __iter__(self):
+        if self._chunked():
+            return itertools.chain.from_iterable(self._chunks())
+        return super().__iter__()
+    
+    def __reversed__(self):
+        if self._chunked():
+            return itertools.chain.from_iterable(self._chunks(reverse=True))
+        return super().__reversed__()
+    
+    def _chunked(self):
+        """Return whether `self` can be traversed by `_chunks`."""
+        return isinstance(self._seq, _NATIVE_SLICEABLE) or self._buffered()
+    
+    def _buffered(self):
+        """Return whether `self` is traversed through `buffer()`."""
+        return (isinstance(self._seq, _BUFFER_TYPES)
+            and getattr(self._seq, 'typecode', None) not in _UNLISTABLE_TYPECODES)
+    
+    def _chunks(self, reverse=False, lo=0, hi=None):
+        """
+        Generate native slices of the base sequence, or lists of items read from `self.buffer()`,
+        whose concatenation is `self[lo:hi]` (or `self[lo:hi]` reversed, if `reverse`).
+        
+        Precondition: `self._chunked()`, and `0 <= lo <= hi <= self.len()`.
+        Each slice has at most `_CHUNK_SIZE` items, except that a range base is sliced all at once,
+        since slicing a range takes constant time and space.
+        """
+        if hi is None:
+            hi = self.len()
+        if self._buffered():
+            for offset in range(0, hi - lo, _CHUNK_SIZE):
+                first, last = lo + offset, min(lo + offset + _CHUNK_SIZE, hi)
+                if reverse:
+                    first, last = lo + hi - last, lo + hi - first
+                with self.buffer() as view, view[first:last] as chunk:
+                    items = chunk.tolist()
+                yield items[::-1] if reverse else items
+            return
+            # Each chunk is copied out of a fresh view, which is released before yielding,
+            # so the base sequence is free to be resized or closed between chunks, as when iterating it natively.
+        
+        start, _, step = self._bounds()
+        start, L = start + lo * step, hi - lo
+        if reverse:
+            start, step = start + (L - 1) * step, -step
+        chunk = (L or 1) if isinstance(self._seq, range) else _CHUNK_SIZE
+        for offset in range(0, L, chunk):
+            first = start + offset * step
+            stop = first + min(chunk, L - offset) * step
+            yield self._seq[first:(stop if stop >= 0 else None):step]
+        # Correctness argument: `start` is the nonnegative index of the first item, so the chunk at `offset` holds
+        # the items at `first`, `first + step`, ..., up to but excluding `stop`. Only a negative step can take `stop`
+        # below zero, which would count from the end of the base sequence; so this case, in which the chunk runs
+        # through the front of the base sequence, is expressed as a stop of None instead.
+    
+    ###########
+    # Buffers #
+    ###########
+    
+    def buffer(self):
+        """
+        Return a memoryview of the items of `self`, sharing memory with the base sequence.
+        
+        Precondition: The base sequence supports the buffer protocol, as a one-dimensional buffer.
+        Postcondition: `self.buffer().tolist() == list(self)`; the memoryview is strided if the step size is not 1.
+        """
+        view = memoryview(self._seq)
+        start, _, step = self._bounds()
+        L = self.len()
+        if L == 0:
+            return view[0:0] # `start` may be -1 here, which would select from the end.
+        stop = start + L * step
+        return view[start:(stop if stop >= 0 else None):step]
+        # Correctness argument: As for `_chunks`.
+    
+    def __buffer__(self, flags):
+        return self.buffer()
+    
+    #############
+    # Searching #
+    #############
+    
+    def __contains__(self, x):
+        if not self._native_item(x):
+            return super().__contains__(x)
+        try:
+            self.index(x)
+        except ValueError:
+            return False
+        return True
+    
+    def index(self, x, start=0, stop=None):
+        """
+        Return the first index of `x` in `self[start:stop]`, as an index into `self`.
+        Raise ValueError if `x` is not present.
+        """
+        if not self._native_item(x):
+            return super().index(x, start, stop)
+        lo, hi, _ = slice(start, stop).indices(self.len())
+        base_start, _, step = self._bounds()
+        if lo < hi:
+            if step == 1 and isinstance(self._seq, _NATIVE_BOUNDED_INDEX):
+                try:
+                    return self._seq.index(x, base_start + lo, base_start + hi) - base_start
+                except ValueError:
+                    pass
+            else:
+                for chunk in self._chunks(lo=lo, hi=hi):
+                    try:
+                        return lo + chunk.index(x)
+                    except ValueError:
+                        lo += len(chunk)
+        raise ValueError("SeqSlice.index(x): x not in sequence")
+        # Correctness argument: `lo` and `hi` are the bounds `start` and `stop` normalized as in slicing.
+        # Position `i` of `self` is position `base_start + i * step` of the base sequence, so for a step of 1,
+        # `self[lo:hi]` is `self._seq[base_start + lo : base_start + hi]` and positions translate back by subtraction.
+        # Otherwise, the chunks concatenate to `self[lo:hi]`, and `lo` is advanced to the position of each chunk in turn.
+    
+    def count(self, x):
+        """Return the number of occurrences of `x` in `self`."""
+        if not self._native_item(x):
+            return super().count(x)
+        start, _, step = self._bounds()
+        if step == 1 and isinstance(self._seq, (str, bytes, bytearray)):
+            return self._seq.count(x, start, start + self.len())
+        return sum(chunk.count(x) for chunk in self._chunks())
+    
+    def _native_item(self, x):
+        """
+        Return whether `x` can be searched for with the native search methods of the base sequence,
+        with the same results as comparing it to each item.
+        """
+        if isinstance(self._seq, str):
+            return isinstance(x, str) and len(x) == 1  # Longer strings would be searched for as substrings,
+        elif isinstance(self._seq, (bytes, bytearray)):
+            return isinstance(x, int) and 0 <= x < 256 # and likewise for bytes-like objects.
+        return self._chunked()
 
 
 if __name__ == "__main__":
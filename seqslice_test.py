@@ -18,8 +18,11 @@
 
 """Unit tests for the `seqslice` module and its `SeqSlice` class."""
 
-import unittest, itertools
-from seqslice import SeqSlice
+import unittest, itertools, mmap, pickle, sys
+from unittest import mock
+from array import array
+from reversed import numpy
+from seqslice import SeqSlice, _CHUNK_SIZE
 from string import ascii_lowercase
 
 class TestSeqSlice(unittest.TestCase):
@@ -63,8 +66,8 @@ class TestSeqSlice(unittest.TestCase):
         # Coverage: Principally __getitem__ (slice branch), _compose_slice
         
         # Start & stop positions for outer slices.
-        starts_o = (None, 2, 10, -23, -15)
-        stops_o  = (None, 6, 14, -19,  -6)
+        starts_o = (None, 0, 2, 10, -23, -15, -1)
+        stops_o  = (None, 0, 6, 14, -19,  -6)
         
         # Start & stop positions for inner slices.
         starts_i = (None, 1,  4,  -8,  -4)
@@ -107,11 +110,268 @@ class TestSeqSlice(unittest.TestCase):
                     
                     # Iteration produces the correct items
                     self.assertEqual(''.join(inner), expected)
+                    
+                    # Reversal produces the correct items
+                    self.assertEqual(''.join(inner[::-1]), expected[::-1])
+    
+    def test_take(self):
+        """
+        Check that `SeqSlice.take` agrees with subscripting one index at a time, with and without NumPy,
+        for built-in bases and for bases with their own `take` method.
+        """
+        # Coverage: take
+        from combinatorics import Product
+        letters = list(ascii_lowercase)
+        P = Product('abc', range(4))
+        for numpy_ in (numpy, None):
+            for base, index in itertools.product((letters, P), (slice(2, -3, 3), slice(-2, None, -5), slice(5, 6))):
+                instance = SeqSlice(base, index)
+                L = len(instance)
+                indices = [0, -1, L - 1, -L, 0]
+                with self.subTest(numpy=numpy_ is not None, base=base, index=index), mock.patch('reversed.numpy', numpy_):
+                    self.assertEqual(instance.take(indices), [instance[i] for i in indices])
+                    self.assertEqual(instance.take([]), [])
+                    for bad_indices in ([L], [0, -L - 1]):
+                        with self.assertRaises(IndexError):
+                            instance.take(bad_indices)
+    
+    def test_frozen(self):
+        """
+        Check that slices of immutable sequences are frozen by default, and agree with unfrozen slices;
+        and that a frozen slice of a mutable sequence keeps its bounds until refreshed.
+        """
+        # Coverage: __new__, refresh, _bounds, len, __getitem__ (frozen branch), _compose_index, _compute_offsets
+        self.assertTrue(SeqSlice(ascii_lowercase, slice(1, None))._frozen)
+        self.assertFalse(SeqSlice(list(ascii_lowercase), slice(1, None))._frozen)
+        
+        for sliceargs in itertools.product(self.startstops, self.startstops, self.steps):
+            index = slice(*sliceargs)
+            frozen = SeqSlice(ascii_lowercase, index)
+            thawed = SeqSlice(ascii_lowercase, index, frozen=False)
+            with self.subTest(index=index):
+                if frozen is ascii_lowercase: # A trivial slice
+                    self.assertEqual(''.join(thawed), ascii_lowercase)
+                    continue
+                self.assertEqual(len(frozen), len(thawed))
+                for i in range(-len(thawed), len(thawed)):
+                    self.assertEqual(frozen._compose_index(i), thawed._compose_index(i))
+                sub = frozen[1::2]
+                self.assertEqual(''.join(sub), ''.join(thawed[1::2]))
+                if isinstance(sub, SeqSlice): # Not an empty string
+                    self.assertTrue(sub._frozen)
+        
+        base = list(range(10))
+        frozen, thawed = SeqSlice(base, slice(2, None), frozen=True), SeqSlice(base, slice(2, None))
+        base.extend(range(10, 20))
+        self.assertEqual(list(thawed), list(range(2, 20)))
+        self.assertEqual(list(frozen), list(range(2, 10)))
+        self.assertTrue(frozen[::2]._frozen)
+        frozen.refresh()
+        self.assertEqual(list(frozen), list(range(2, 20)))
+        self.assertEqual(frozen[-1], 19)
+    
+    def test_dispatch(self):
+        """
+        Check that the SeqSlice constructor delegates to ranges and `SeqSliceable` sequences,
+        and returns the base sequence itself for slices selecting all of it in order.
+        """
+        # Coverage: __new__ (all branches)
+        from combinatorics import Product
+        r = range(3, 30, 2)
+        self.assertEqual(SeqSlice(r, slice(2, -2, 3)), r[2:-2:3])
+        self.assertIsInstance(SeqSlice(r, slice(2, -2, 3)), range)
+        
+        p = Product('abc', repeat=3)
+        self.assertIsInstance(SeqSlice(p, slice(1, -1)), Product.Slice)
+        self.assertIsInstance(SeqSlice(p, slice(None, None, -1)), Product) # Simplified to reversed factors.
+        self.assertEqual(list(SeqSlice(p, slice(5, 20, 4))), list(p)[5:20:4])
+        
+        # Trivial slices of frozen bases are recognised after normalization; of mutable bases, only with an omitted stop.
+        for index in (slice(None), slice(0, None, 1), slice(-99, 99), slice(None, len(ascii_lowercase))):
+            with self.subTest(index=index):
+                self.assertIs(SeqSlice(ascii_lowercase, index), ascii_lowercase)
+        letters = list(ascii_lowercase)
+        self.assertIs(SeqSlice(letters, slice(0, None)), letters)
+        self.assertIsInstance(SeqSlice(letters, slice(None, 99)), SeqSlice)
+        
+        # A frozen full-extent slice of a mutable base keeps its length when the base grows.
+        for index in (slice(None), slice(0, len(letters))):
+            with self.subTest(index=index):
+                base = list(letters)
+                frozen = SeqSlice(base, index, frozen=True)
+                self.assertIsNot(frozen, base)
+                base.append('!')
+                self.assertEqual(len(frozen), len(letters))
+                self.assertEqual(list(frozen), letters)
+        
+        # A SeqSlice base is sliced by composition, leaving it untouched.
+        s = SeqSlice(ascii_lowercase, slice(2, None, 2))
+        t = SeqSlice(s, slice(None))
+        self.assertIs(t._seq, ascii_lowercase)
+        self.assertEqual(t._slice, slice(2, None, 2))
+        self.assertEqual(s._slice, slice(2, None, 2))
+        
+        # Composing slices honours an explicit `frozen`, and otherwise inherits the mode of the base slice.
+        letters = list(ascii_lowercase)
+        thawed = SeqSlice(letters, slice(1, None))
+        for frozen, expected in ((True, True), (False, False), (None, False)):
+            with self.subTest(frozen=frozen):
+                composed = SeqSlice(thawed, slice(None, None, 2), frozen=frozen)
+                self.assertIs(composed._seq, letters)
+                self.assertIs(composed._frozen, expected)
+                self.assertEqual(list(composed), letters[1::2])
+        self.assertFalse(SeqSlice(s, slice(1, None), frozen=False)._frozen)
+        self.assertEqual(SeqSlice(thawed, slice(99, None), frozen=True), [])
     
-    ########################################################
-    # Iteration, searching: Correctness implied by that of #
-    # __len__, __getitem__, and collections.abc.Sequence   #
-    ########################################################
+    def test_flatten(self):
+        """
+        Check that stacks of `SeqSlice` and `Reversed` views collapse into a single `SeqSlice` of the base sequence,
+        producing the same items as the corresponding explicit slices and reversals.
+        """
+        # Coverage: __new__ (SeqSliceable and Reversed branches), _seqtools_reversed
+        from reversed import Reversed
+        letters = list(ascii_lowercase)
+        indices = [slice(*args) for args in itertools.product((None, 2, -3), (None, 20, -2), (None, 2, -1))]
+        for a, b, c in itertools.product(indices[::3], indices[1::3], indices[2::3]):
+            view = Reversed(SeqSlice(Reversed(SeqSlice(Reversed(letters), a)), b))
+            view = SeqSlice(view, c)
+            expected = letters[::-1][a][::-1][b][::-1][c]
+            with self.subTest(a=a, b=b, c=c):
+                self.assertEqual(list(view), expected)
+                if expected: # Otherwise some intermediate view may have been an empty list.
+                    self.assertIs(getattr(view, '_seq', view), letters)
+    
+    def test_compact(self):
+        """
+        Check that views carry no instance dictionary, that frozen slices of immutable bases
+        reconstruct an equivalent slice from their bounds, and that views can be interned and pickled.
+        """
+        # Coverage: __slots__, _slice, interned, __reduce__
+        instance = SeqSlice(ascii_lowercase, slice(-20, 99, 3))
+        self.assertFalse(hasattr(instance, '__dict__'))
+        self.assertIsNone(instance._sl)
+        self.assertEqual(instance._slice, slice(6, None, 3))
+        self.assertEqual(SeqSlice(ascii_lowercase, slice(-1, -99, -1))._slice, slice(None, None, -1))
+        self.assertEqual(repr(instance), "<SeqSlice {!r}[6::3]>".format(ascii_lowercase)) # Shows the normalized bounds.
+        
+        # Each view is smaller than an instance of a dictionary-backed class with the same attributes would be.
+        class Unslotted:
+            pass
+        for view in (instance, SeqSlice(list(ascii_lowercase), slice(1, -1, 2)), SeqSlice(ascii_lowercase, slice(1, -1), frozen=False)):
+            with self.subTest(view=view):
+                unslotted = Unslotted()
+                for name in type(view).__slots__:
+                    if hasattr(view, name) and name != '__weakref__':
+                        setattr(unslotted, name, getattr(view, name))
+                self.assertLess(sys.getsizeof(view), sys.getsizeof(unslotted) + sys.getsizeof(unslotted.__dict__))
+        
+        letters = list(ascii_lowercase)
+        a, b = SeqSlice.interned(letters, slice(1, -1, 2)), SeqSlice.interned(letters, slice(1, -1, 2))
+        self.assertIs(a, b)
+        self.assertIsNot(SeqSlice.interned(list(letters), slice(1, -1, 2)), a) # An equal but distinct base
+        self.assertIsNot(SeqSlice.interned(letters, slice(1, -1, 2), frozen=True), a)
+        self.assertIs(SeqSlice.interned(letters, slice(None)), letters)
+        
+        for view in (a, instance):
+            with self.subTest(view=view):
+                copy = pickle.loads(pickle.dumps(view))
+                self.assertEqual(list(copy), list(view))
+                self.assertEqual(copy._slice, view._slice)
+    
+    def test_native_iteration(self):
+        """
+        Check that iterating forwards and backwards over slices of built-in sequences,
+        which copies native slices in chunks, produces the same items as ordinary explicit slices.
+        """
+        # Coverage: __iter__, __reversed__, _chunks (including chunks that run through the front of the base)
+        N = 2 * _CHUNK_SIZE + 5
+        bases = (list(range(N)), tuple(range(N)), (ascii_lowercase * N)[:N], bytes(range(256)) * (N // 256 + 1),
+                 bytearray(N), range(N), array('i', range(N)))
+        indices = (slice(None), slice(None, None, -1), slice(5, -5, 3), slice(-5, 100, -7),
+                   slice(N - 1, None, -_CHUNK_SIZE), slice(0, 0), slice(None, None, _CHUNK_SIZE + 1))
+        for base, index in itertools.product(bases, indices):
+            expected = list(base[index])
+            with self.subTest(base=type(base), index=index):
+                instance = SeqSlice(base, index)
+                self.assertEqual(list(instance), expected)
+                self.assertEqual(list(reversed(instance)), expected[::-1])
+    
+    ###########
+    # Buffers #
+    ###########
+    
+    def test_buffer(self):
+        """
+        Check that slices of buffer-protocol sequences expose strided memoryviews sharing memory with the base,
+        and iterate and search through them.
+        """
+        # Coverage: buffer, __buffer__, _buffered, _chunks (buffer branch)
+        data = bytearray(range(200))
+        for index in (slice(3, -3), slice(None, None, -7), slice(150, 10, -3), slice(-1, -99, -1), slice(5, 5)):
+            with self.subTest(index=index):
+                view = SeqSlice(data, index).buffer()
+                self.assertIsInstance(view, memoryview)
+                self.assertEqual(view.tolist(), list(data[index]))
+                self.assertEqual(SeqSlice(data, index).__buffer__(0).tolist(), list(data[index]))
+        
+        view = SeqSlice(data, slice(1, None, 2)).buffer()
+        data[3] = 0
+        self.assertEqual(view[1], 0) # Shared, not copied.
+        view.release()
+        
+        with mmap.mmap(-1, 3 * _CHUNK_SIZE) as mapped:
+            mapped[:] = bytes(range(256)) * (3 * _CHUNK_SIZE // 256)
+            instance = SeqSlice(mapped, slice(10, None, 3))
+            expected = list(mapped[10::3])
+            self.assertEqual(list(instance), expected)
+            self.assertEqual(list(reversed(instance)), expected[::-1])
+            self.assertEqual(instance.count(7), expected.count(7))
+            self.assertEqual(instance.index(7, 100), expected.index(7, 100))
+            self.assertNotIn(300, instance)
+        
+        # No buffer is held between chunks, so the base can be resized or closed during iteration.
+        data = bytearray(3 * _CHUNK_SIZE)
+        for reverse in (False, True):
+            with self.subTest(reverse=reverse):
+                instance = SeqSlice(data, slice(None, 2 * _CHUNK_SIZE))
+                items = reversed(instance) if reverse else iter(instance)
+                next(items)
+                data.extend(b'more')
+                del data[-4:]
+        with mmap.mmap(-1, 3 * _CHUNK_SIZE) as mapped:
+            items = iter(SeqSlice(mapped, slice(1, None, 2)))
+            next(items)
+        # Leaving the `with` block closes the mapping, which would raise BufferError with an export outstanding.
+    
+    #############
+    # Searching #
+    #############
+    
+    def test_search(self):
+        """
+        Check that `in`, `index`, and `count` agree with searching explicit slices of built-in sequences,
+        whether searched natively or (for items the base cannot search natively) by the Sequence ABC.
+        """
+        # Coverage: __contains__, index, count, _native_item, _chunks (with bounds)
+        text = 'abcabcabzz' * 3
+        bases = (list(text), tuple(text), text, text.encode(), bytearray(text.encode()), array('u', text))
+        indices = [slice(*args) for args in itertools.product((1, -5, 7), (None, -2, 20), (None, 2, -1, -3))]
+        bounds = ((), (2,), (-4,), (1, -1), (3, 2), (-99, 99))
+        for base in bases:
+            items = set(base) | {'ab', 'q', b'a', 300, None}
+            for index, x in itertools.product(indices, items):
+                instance, expected = SeqSlice(base, index), list(base[index])
+                with self.subTest(base=type(base), index=index, x=x):
+                    self.assertEqual(x in instance, x in expected)
+                    self.assertEqual(instance.count(x), expected.count(x))
+                    for args in bounds:
+                        try:
+                            i = expected.index(x, *args)
+                        except ValueError:
+                            with self.assertRaises(ValueError):
+                                instance.index(x, *args)
+                        else:
+                            self.assertEqual(instance.index(x, *args), i)
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file